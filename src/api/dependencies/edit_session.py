@@ -0,0 +1,52 @@
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import src.api.dependencies.ml_model as ml_model
+from src.collector import accumulate_sections, accumulated_metrics
+from src.features.accumulators import FeatureAccumulator
+from src.api.schemas.prediction import LiveEditResponse
+from src.config.api_config import PREDICT_BATCH_SIZE, LIVE_SESSION_PARAGRAPHS
+
+def parse_paragraphs(norm_texts: List[str]) -> List[FeatureAccumulator]:
+    # runs inline or in a pool worker; the accumulators are small enough to pickle back
+    return list(accumulate_sections(ml_model.nlp, norm_texts, PREDICT_BATCH_SIZE))
+
+class EditSession:
+    # State of one live-editing connection: the FeatureAccumulator of every paragraph parsed so far,
+    # keyed by the hash of its normalized text, least recently used first.
+    def __init__(self, max_paragraphs: int = LIVE_SESSION_PARAGRAPHS):
+        self.max_paragraphs = max_paragraphs
+        self._paragraphs: "OrderedDict[str, FeatureAccumulator]" = OrderedDict()
+        # last prediction pushed and the length of its text, logged once the connection closes
+        self.last_response: Optional[LiveEditResponse] = None
+        self.last_length = 0
+
+    def __len__(self) -> int:
+        return len(self._paragraphs)
+
+    @staticmethod
+    def key(norm_text: str) -> str:
+        return hashlib.sha256(norm_text.encode("utf-8")).hexdigest()
+
+    def missing(self, keys: List[str], norm_texts: List[str]) -> Dict[str, str]:
+        # paragraphs of the current text that still have to be parsed; the cached ones become most recent
+        missing: Dict[str, str] = {}
+        for key, norm_text in zip(keys, norm_texts):
+            if key in self._paragraphs:
+                self._paragraphs.move_to_end(key)
+            else:
+                missing.setdefault(key, norm_text)
+        return missing
+
+    def store(self, parsed: Dict[str, FeatureAccumulator], keep: int = 0):
+        # keep: paragraphs of the current text, never evicted even beyond max_paragraphs
+        self._paragraphs.update(parsed)
+        while len(self._paragraphs) > max(self.max_paragraphs, keep):
+            self._paragraphs.popitem(last=False)
+
+    def combine(self, keys: List[str], norm_texts: List[str]) -> Dict[str, float]:
+        # merges into a fresh accumulator, so the cached ones stay reusable
+        total = FeatureAccumulator()
+        for key in keys:
+            total.merge(self._paragraphs[key])
+        return accumulated_metrics(total, " ".join(norm_texts))
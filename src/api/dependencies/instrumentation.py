@@ -0,0 +1,68 @@
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from fastapi import Request
+from src.core.timing import Histogram, request_stages, finish_request, server_timing
+from src.config.api_config import (
+    PREDICT_EXECUTION, PROFILE_SLOW_MS, PROFILE_SAMPLE_RATE, PROFILE_INTERVAL, PROFILE_DIR,
+)
+
+try:
+    from pyinstrument import Profiler
+except ImportError:
+    Profiler = None
+
+request_seconds = Histogram(
+    "text_complexity_request_seconds", "HTTP request latency by endpoint.", ("method", "handler", "status"),
+)
+
+# pyinstrument profiles a whole thread, so one profile at a time per process
+_profiling = threading.Lock()
+
+def _save_profile(profiler, label: str, elapsed_ms: float):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_") or "request"
+    path = PROFILE_DIR / f"{time.strftime('%Y%m%dT%H%M%S')}-{int(elapsed_ms)}ms-{slug}.txt"
+    path.write_text(profiler.output_text(unicode=True, color=False), encoding="utf-8")
+    print(f"Slow call {label} took {elapsed_ms:.0f} ms, profile written to {path}")
+
+@contextmanager
+def slow_profile(label: str):
+    if PROFILE_SLOW_MS <= 0 or Profiler is None or random.random() >= PROFILE_SAMPLE_RATE:
+        yield
+        return
+    if not _profiling.acquire(blocking=False):
+        yield
+        return
+    profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="disabled")
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        _profiling.release()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if elapsed_ms >= PROFILE_SLOW_MS:
+            _save_profile(profiler, label, elapsed_ms)
+
+async def timing_middleware(request: Request, call_next):
+    # Per-stage breakdown of every request: src.core.timing.timed() blocks (also those run in a pool
+    # worker, see run_in_pool) add up in the request's stages, which feed the stage histogram and
+    # the Server-Timing header. Inline analysis runs on this thread, so it is profiled here;
+    # in process mode the worker profiles it.
+    start = time.perf_counter()
+    label = f"{request.method} {request.url.path}"
+    profile = slow_profile(label) if PREDICT_EXECUTION != "process" else nullcontext()
+    with request_stages() as stages, profile:
+        response = await call_next(request)
+    total = time.perf_counter() - start
+
+    finish_request(stages)
+    # the endpoint function name: bounded label values, unlike raw paths
+    handler = getattr(request.scope.get("endpoint"), "__name__", "unmatched")
+    request_seconds.observe((request.method, handler, str(response.status_code)), total)
+    response.headers["Server-Timing"] = server_timing(stages, total)
+    return response
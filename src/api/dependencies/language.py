@@ -1,15 +1,93 @@
+import re
+from typing import List, Optional, Sequence, Tuple
 from fastapi import HTTPException
-from langdetect import detect, LangDetectException
+from langdetect import detect, DetectorFactory, LangDetectException
+from spacy.lang.en.stop_words import STOP_WORDS
+from spacy.tokens import Doc
+from src.core.timing import timed
+from src.config.api_config import (
+    LANGUAGE_GATE, LANGUAGE_SAMPLE_CHARS, LANGUAGE_SAMPLE_TOKENS, LANGUAGE_MIN_STOP_SHARE,
+)
 
-def ensure_english(text: str):
-    cleaned = text.strip()
-    if len(cleaned) < 150:
-        return
+# langdetect is randomized; a fixed seed gives the same answer for the same text
+DetectorFactory.seed = 0
+
+# the "fast" gate can decide on the parsed Doc, so callers that parse anyway check it afterwards
+GATE_ON_DOC = LANGUAGE_GATE == "fast"
+
+MIN_CHARS = 150
+MIN_SAMPLE_WORDS = 20
+# letters beyond Latin Extended-B
+MAX_FOREIGN_SCRIPT_SHARE = 0.3
+# only used when the vocab has vectors
+MAX_OOV_SHARE = 0.5
+WORD_RE = re.compile(r"[^\W\d_]+")
+
+def _windows(seq: Sequence, limit: int) -> List[Sequence]:
+    # deterministic bounded sample: the head, middle and tail thirds of limit
+    if len(seq) <= limit:
+        return [seq]
+    third = max(1, limit // 3)
+    mid = (len(seq) - third) // 2
+    return [seq[:third], seq[mid:mid + third], seq[len(seq) - third:]]
+
+def _foreign_share(words: List[str]) -> float:
+    letters = sum(len(w) for w in words)
+    if not letters:
+        return 0.0
+    return sum(1 for w in words for ch in w if ord(ch) > 0x24F) / letters
+
+def text_signals(text: str) -> Tuple[List[str], float, Optional[float], float]:
+    # (words, stopword share, OOV share, foreign-script share) of a bounded sample of the text
+    words = [w.lower() for window in _windows(text, LANGUAGE_SAMPLE_CHARS) for w in WORD_RE.findall(window)]
+    stop_share = sum(w in STOP_WORDS for w in words) / len(words) if words else 0.0
+    return words, stop_share, None, _foreign_share(words)
+
+def doc_signals(doc: Doc) -> Tuple[List[str], float, Optional[float], float]:
+    # the same signals from the token flags the parse already computed
+    tokens = [t for window in _windows(doc, LANGUAGE_SAMPLE_TOKENS) for t in window if t.is_alpha]
+    words = [t.text for t in tokens]
+    if not tokens:
+        return words, 0.0, None, 0.0
+    stop_share = sum(t.is_stop for t in tokens) / len(tokens)
+    oov_share = sum(t.is_oov for t in tokens) / len(tokens) if doc.vocab.vectors.n_keys else None
+    return words, stop_share, oov_share, _foreign_share(words)
 
+def english_verdict(words: List[str], stop_share: float, oov_share: Optional[float],
+                    foreign_share: float) -> Optional[bool]:
+    # True / False when the signals are clear, None when langdetect has to decide (short samples,
+    # keyword lists and jargon have few stopwords in any language)
+    if foreign_share > MAX_FOREIGN_SCRIPT_SHARE:
+        return False
+    if len(words) < MIN_SAMPLE_WORDS:
+        return None
+    if stop_share >= LANGUAGE_MIN_STOP_SHARE and (oov_share is None or oov_share <= MAX_OOV_SHARE):
+        return True
+    return None
+
+def _langdetect(text: str):
     try:
-        lang = detect(cleaned)
+        with timed("langdetect"):
+            lang = detect(text)
     except LangDetectException:
         raise HTTPException(400, "Не вдалося визначити мову тексту.")
 
     if lang != "en":
         raise HTTPException(400, "Підтримуються лише англійські тексти.")
+
+def ensure_english(text: str, doc: Optional[Doc] = None):
+    # doc: the parse of text, used instead of the text sample by the "fast" gate
+    cleaned = text.strip()
+    if len(cleaned) < MIN_CHARS:
+        return
+
+    if LANGUAGE_GATE != "fast":
+        _langdetect(cleaned)
+        return
+
+    with timed("language_gate"):
+        verdict = english_verdict(*(doc_signals(doc) if doc is not None else text_signals(cleaned)))
+    if verdict is None:
+        _langdetect(" ".join(_windows(cleaned, LANGUAGE_SAMPLE_CHARS)))
+    elif not verdict:
+        raise HTTPException(400, "Підтримуються лише англійські тексти.")
@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from src.db.database import SessionLocal
+from src.db.models import AnalysisLog
+from src.db.rollups import apply_rollups
+from src.core.timing import timed
+from src.config.api_config import LOG_QUEUE_SIZE, LOG_FLUSH_SIZE, LOG_FLUSH_INTERVAL
+
+_STOP = object()
+
+class AnalysisLogWriter:
+    # Write-behind AnalysisLog sink: requests enqueue rows and return, a daemon thread inserts
+    # them in multi-row batches once LOG_FLUSH_SIZE rows are queued or LOG_FLUSH_INTERVAL passes.
+    # The queue is bounded; when it is full new rows are dropped and counted instead of blocking.
+    # The hourly analysis_rollups counters are updated in the same transaction as the insert.
+    def __init__(self, max_queue: int, flush_size: int, flush_interval: float, session_factory=SessionLocal):
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="analysis-log-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, level_id: int, level_label: str, text_length: int, source_type: str) -> bool:
+        self.start()
+        row = {
+            "created_at": datetime.utcnow(),
+            "level_id": level_id,
+            "level_label": level_label,
+            "text_length": text_length,
+            "source_type": source_type,
+        }
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def _take_batch(self) -> Tuple[List[Dict], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                row = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    def _flush(self, batch: List[Dict]):
+        db = self.session_factory()
+        try:
+            with timed("db_flush"):
+                db.execute(insert(AnalysisLog), batch)
+                apply_rollups(db, batch)
+                db.commit()
+            with self._lock:
+                self.flushed += len(batch)
+                self.batches += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            with self._lock:
+                self.failed += len(batch)
+            print(f"Failed to write {len(batch)} analysis logs: {e}")
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            batch, stopping = self._take_batch()
+            if batch:
+                self._flush(batch)
+            if stopping:
+                break
+
+        rest = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                rest.append(row)
+        for i in range(0, len(rest), self.flush_size):
+            self._flush(rest[i:i + self.flush_size])
+
+    def shutdown(self, timeout: Optional[float] = None):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+log_writer = AnalysisLogWriter(LOG_QUEUE_SIZE, LOG_FLUSH_SIZE, LOG_FLUSH_INTERVAL)
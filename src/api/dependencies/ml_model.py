@@ -1,15 +1,131 @@
+import hashlib
+import time
 from pathlib import Path
+from typing import Dict, NamedTuple, Optional
 import joblib
-from src.core.spacy_nlp import load_spacy_nlp
+from src.core.spacy_nlp import load_spacy_nlp, uses_static_vectors
+from src.core.flat_forest import FlatForest
+from src.core.mapped_vectors import attach_vectors, vectors_exported
+from src.features.requirements import pipeline_requirements
+from src.features.registry import resolve_features
+from src.features.morph import precompute_affix_morphemes
+from src.api.dependencies.warmup import warmup
+from src.config.model_config import ID2LEVEL
+from src.config.feature_config import FEATURE_GROUPS, MORPHEME_PRECOMPUTE
+from src.config.api_config import MODEL_LOAD_MODE, SHARED_MODEL_DIR, STARTUP_WARMUP, FOREST_ENGINE
+
+MODEL_PATH = Path(__file__).resolve().parents[3] / "models" / "cefr_random_forest.pkl"
+SPACY_MODEL = "en_core_web_md"
+
+class ModelState(NamedTuple):
+    clf: object
+    version: str
 
 nlp = None
 clf = None
+nlp_version = None
+model_version = None
+# clf and model_version as one reference: a request reads it once, so a reload swapping it
+# mid-request cannot mix two models
+model_state: Optional[ModelState] = None
+load_mode = None
+ready = False
+load_times: Dict[str, float] = {}
 
-def load_resources():
-    global nlp, clf
-    nlp = load_spacy_nlp("en_core_web_md")
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
 
-    model_path = Path(__file__).resolve().parents[3] / "models" / "cefr_random_forest.pkl"
+def load_bundle_model(model_path: Path = MODEL_PATH):
     bundle = joblib.load(model_path)
+    return bundle["model"] if isinstance(bundle, dict) else bundle
+
+def compile_forest(model):
+    try:
+        return FlatForest.from_sklearn(model)
+    except AttributeError:
+        print(f"{type(model).__name__} cannot be compiled into a FlatForest, using it as is.")
+        return model
+
+def load_classifier(model_path: Path = MODEL_PATH) -> ModelState:
+    model = load_bundle_model(model_path)
+    if FOREST_ENGINE == "flat" or load_mode == "mmap":
+        model = compile_forest(model)
+    return ModelState(model, _file_digest(model_path))
+
+def check_classifier(model):
+    # The API feeds the model the features of FEATURE_GROUPS only, so a reduced deployment needs a
+    # model trained on those groups.
+    expected = len(resolve_features())
+    n_features = getattr(model, "n_features_in_", expected)
+    if n_features != expected:
+        raise ValueError(f"Model expects {n_features} features, the API computes {expected} "
+                         f"(FEATURE_GROUPS={','.join(FEATURE_GROUPS)})")
+    unknown = [c for c in getattr(model, "classes_", []) if int(c) not in ID2LEVEL]
+    if unknown:
+        raise ValueError(f"Model predicts unknown level ids: {unknown}")
+
+def validate_classifier(model):
+    check_classifier(model)
+    warmup(nlp, model)
+
+def prepare_model(model_path: Path = MODEL_PATH) -> ModelState:
+    # Loads and validates a new bundle next to the serving one, which stays active meanwhile.
+    if nlp is None:
+        raise RuntimeError("Resources are not loaded")
+    state = load_classifier(model_path)
+    validate_classifier(state.clf)
+    return state
+
+def activate_model(state: ModelState):
+    global clf, model_version, model_state
+    model_state = state
+    clf, model_version = state.clf, state.version
+
+def _shared_available() -> bool:
+    return FlatForest.exists(SHARED_MODEL_DIR / "forest") and vectors_exported(SHARED_MODEL_DIR / "vectors")
+
+def _timed(name: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    load_times[name] = round(time.perf_counter() - start, 3)
+    return result
+
+def load_resources(model_path: Optional[Path] = None):
+    # model_path forces the classifier to come from that bundle, also in mmap mode (used after a reload).
+    global nlp, nlp_version, load_mode
+    load_times.clear()
+
+    load_mode = MODEL_LOAD_MODE
+    if load_mode == "mmap" and not _shared_available():
+        print(f"Shared model files not found in {SHARED_MODEL_DIR}, falling back to pickle loading.")
+        load_mode = "pickle"
+
+    requires = pipeline_requirements()
+    if load_mode == "mmap":
+        nlp = _timed("spacy", lambda: load_spacy_nlp(SPACY_MODEL, requires, load_vectors=False))
+        # tok2vec with static vectors needs the table even when no feature group reads it
+        if "vectors" in requires or uses_static_vectors(nlp):
+            _timed("vectors", lambda: attach_vectors(nlp, SHARED_MODEL_DIR / "vectors"))
+    else:
+        nlp = _timed("spacy", lambda: load_spacy_nlp(SPACY_MODEL, requires))
+
+    if load_mode == "mmap" and model_path is None:
+        forest = _timed("forest", lambda: FlatForest.load(SHARED_MODEL_DIR / "forest"))
+        state = ModelState(forest, forest.meta.get("model_version"))
+    else:
+        state = _timed("forest", lambda: load_classifier(model_path or MODEL_PATH))
+    # fail at startup rather than with a 500 on every prediction
+    check_classifier(state.clf)
+    activate_model(state)
+
+    if MORPHEME_PRECOMPUTE and "morph" in FEATURE_GROUPS:
+        _timed("morphemes", lambda: precompute_affix_morphemes(nlp.vocab))
+
+    nlp_version = f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', '')}-{nlp.meta.get('version', '')}:{','.join(nlp.pipe_names)}"
 
-    clf = bundle["model"] if isinstance(bundle, dict) else bundle
+    if STARTUP_WARMUP:
+        _timed("warmup", lambda: warmup(nlp, clf))
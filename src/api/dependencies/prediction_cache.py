@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+import src.api.dependencies.ml_model as ml_model
+from src.api.schemas.prediction import PredictionResponse
+from src.core.textnorm import normalize_text
+from src.config.api_config import PREDICT_CACHE_SIZE, PREDICT_CACHE_DIR
+
+class PredictionCache:
+    def __init__(self, max_size: int, disk_dir: Optional[str] = None):
+        self.max_size = max_size
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._items: "OrderedDict[str, PredictionResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> future of the request computing it; resolves to None when that request was cancelled
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def key(self, text: str) -> str:
+        h = hashlib.sha256()
+        for part in (ml_model.model_version or "", ml_model.nlp_version or "", normalize_text(text)):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, value: PredictionResponse):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key: str) -> Optional[PredictionResponse]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            value = PredictionResponse.model_validate(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, value)
+        with self._lock:
+            self.hits += 1
+            self.disk_hits += 1
+        return value
+
+    def put(self, key: str, value: PredictionResponse):
+        self._remember(key, value)
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(value.model_dump_json(), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[PredictionResponse]]) -> PredictionResponse:
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            value = await asyncio.shield(inflight)
+            if value is not None:
+                return value
+            # the request computing it was cancelled: the waiting ones compute it again, one of
+            # them in the lead
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.record_miss()
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.set_result(None)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+        self.put(key, value)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "inflight": len(self._inflight),
+            }
+
+prediction_cache = PredictionCache(PREDICT_CACHE_SIZE, PREDICT_CACHE_DIR)
@@ -0,0 +1,22 @@
+import numpy as np
+from src.api.dependencies.language import ensure_english
+from src.collector import features_from_doc
+from src.core.textnorm import normalize_text
+from src.features.registry import resolve_features
+
+WARMUP_TEXT = (
+    "Scientists have been studying how forests recover after severe wildfires. "
+    "Although the damage looks permanent, many species return within a few years, "
+    "because seeds that survived underground begin to grow as soon as it rains. "
+    "Researchers measured the growth of young trees and compared it with older records. "
+    "They concluded that careful protection would probably help the ecosystem recover faster."
+)
+
+def warmup(nlp, clf):
+    # Touches every lazily loaded resource (language detector, WordNet, wordfreq, textstat,
+    # word lists and the forest arrays) so the first real request does not pay for it.
+    ensure_english(WARMUP_TEXT)
+    norm_text = normalize_text(WARMUP_TEXT)
+    metrics = features_from_doc(nlp(norm_text), norm_text)
+    x = np.array([[metrics[name] for name in resolve_features()]], dtype=float)
+    clf.predict_proba(x)
@@ -0,0 +1,130 @@
+import asyncio
+import multiprocessing
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+from fastapi import HTTPException
+import src.api.dependencies.ml_model as ml_model
+from src.api.dependencies.instrumentation import slow_profile
+from src.core.timing import call_timed, record, record_all
+from src.config.api_config import PREDICT_POOL_WORKERS, PREDICT_POOL_MAX_PENDING
+
+executor: Optional[ProcessPoolExecutor] = None
+pending = 0
+# (model_path, expected_version) the serving pool was started with, reused when it has to be rebuilt
+_pool_args: Tuple[Optional[Path], Optional[str]] = (None, None)
+_rebuild: Optional[asyncio.Task] = None
+
+def _init_worker(model_path: Optional[Path] = None, loaded=None):
+    ml_model.load_resources(model_path)
+    if loaded is not None:
+        loaded.put(_ready())
+
+def _ready() -> Optional[str]:
+    if ml_model.nlp is None or ml_model.model_state is None:
+        return None
+    return ml_model.model_state.version
+
+def _timed_task(fn: Callable, *args):
+    # runs in the worker: the stages timed there travel back with the result
+    with slow_profile(getattr(fn, "__name__", "task")):
+        return call_timed(fn, *args)
+
+def _new_pool(workers: int, model_path: Optional[Path] = None, expected_version: Optional[str] = None) -> ProcessPoolExecutor:
+    ctx = multiprocessing.get_context("spawn")
+    loaded = ctx.Queue()
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(model_path, loaded),
+    )
+    # One task per worker spawns them all; each initializer reports the model version it loaded,
+    # so the pool is only used once every worker is up, not just the first one to answer.
+    futures = [pool.submit(_ready) for _ in range(workers)]
+    versions = []
+    while len(versions) < workers:
+        try:
+            versions.append(loaded.get(timeout=1.0))
+        except queue.Empty:
+            failed = [f for f in futures if f.done() and f.exception() is not None]
+            if failed:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise RuntimeError(f"Pool worker failed to start: {failed[0].exception()}")
+    if None in versions or len(set(versions)) != 1 or (expected_version and versions[0] != expected_version):
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise RuntimeError(f"Pool workers loaded model versions {sorted(set(map(str, versions)))}, expected {expected_version}")
+    return pool
+
+def start_pool(workers: int = PREDICT_POOL_WORKERS):
+    global executor
+    if executor is not None:
+        return
+    executor = _new_pool(workers)
+
+async def swap_pool(model_path: Path, expected_version: str, workers: int = PREDICT_POOL_WORKERS):
+    # Blue/green reload: a second pool loads the new bundle while the old one keeps serving.
+    # The swap itself runs on the event loop thread, so run_in_pool never submits to a pool
+    # that is shutting down; the old pool exits once its queued work is done.
+    global executor, _pool_args
+    if executor is None:
+        return
+    loop = asyncio.get_running_loop()
+    pool = await loop.run_in_executor(None, _new_pool, workers, model_path, expected_version)
+    old, executor = executor, pool
+    _pool_args = (model_path, expected_version)
+    old.shutdown(wait=False)
+
+async def _replace_broken(broken: ProcessPoolExecutor, workers: int = PREDICT_POOL_WORKERS):
+    # A worker that died (OOM kill, crash in a native extension) breaks the whole executor;
+    # a new one is started off the loop and swapped in on it, like swap_pool does.
+    global executor, _rebuild
+    loop = asyncio.get_running_loop()
+    try:
+        pool = await loop.run_in_executor(None, _new_pool, workers, *_pool_args)
+    except Exception as e:
+        print(f"Could not restart the broken worker pool: {e}")
+        return
+    finally:
+        _rebuild = None
+    if executor is broken:
+        executor = pool
+    else:
+        # reloaded or shut down meanwhile
+        pool.shutdown(wait=False, cancel_futures=True)
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_pool():
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+        executor = None
+
+async def run_in_pool(fn: Callable, *args):
+    global pending, _rebuild
+    if executor is None:
+        raise HTTPException(status_code=500, detail="Пул обробки не запущений. Перезапустіть сервер.")
+
+    if pending >= PREDICT_POOL_MAX_PENDING:
+        raise HTTPException(status_code=503, detail="Сервер перевантажений, спробуйте пізніше.")
+
+    pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        pool = executor
+        try:
+            result, stages, seconds = await loop.run_in_executor(pool, _timed_task, fn, *args)
+        except BrokenProcessPool:
+            if _rebuild is None and executor is pool:
+                _rebuild = asyncio.create_task(_replace_broken(pool))
+            raise HTTPException(status_code=503, detail="Пул обробки перезапускається, спробуйте пізніше.")
+        record_all(stages)
+        # queueing, pickling and the round trip to the worker
+        record("pool", time.perf_counter() - start - seconds)
+        return result
+    finally:
+        pending -= 1
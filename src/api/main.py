@@ -1,8 +1,19 @@
+import time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.routes.predict import router as predict_router
 from src.api.routes.stats import router as stats_router
+from src.api.routes.metrics import router as metrics_router
+from src.api.routes.health import router as health_router
+from src.api.routes.admin import router as admin_router
+from src.api.routes.live_edit import router as live_edit_router
+from src.api.routes.prometheus import router as prometheus_router
+import src.api.dependencies.ml_model as ml_model
 from src.api.dependencies.ml_model import load_resources
+from src.api.dependencies.worker_pool import start_pool, shutdown_pool
+from src.api.dependencies.log_writer import log_writer
+from src.api.dependencies.instrumentation import timing_middleware
+from src.config.api_config import PREDICT_EXECUTION
 
 app = FastAPI(title="Text Complexity API", version="1.0.0")
 
@@ -12,11 +23,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.middleware("http")(timing_middleware)
 
 app.include_router(predict_router, prefix="/api")
 app.include_router(stats_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
+app.include_router(health_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
+app.include_router(live_edit_router, prefix="/api")
+# scraped by Prometheus at the conventional path, next to /api
+app.include_router(prometheus_router)
 
 @app.on_event("startup")
 def startup_event():
-    load_resources()
\ No newline at end of file
+    load_resources()
+    if PREDICT_EXECUTION == "process":
+        start = time.perf_counter()
+        start_pool()
+        ml_model.load_times["pool"] = round(time.perf_counter() - start, 3)
+    log_writer.start()
+    ml_model.ready = True
+
+@app.on_event("shutdown")
+def shutdown_event():
+    shutdown_pool()
+    log_writer.shutdown()
@@ -0,0 +1,58 @@
+import asyncio
+import hmac
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+import src.api.dependencies.ml_model as ml_model
+from src.api.dependencies import worker_pool
+from src.api.schemas.admin import ModelReloadResponse
+from src.config.api_config import ADMIN_TOKEN, PREDICT_EXECUTION
+
+router = APIRouter(tags=["admin"])
+
+_reload_lock = asyncio.Lock()
+
+
+def _check_token(token: Optional[str]):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Адмін-доступ вимкнено (ADMIN_TOKEN не задано)")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Невірний токен адміністратора")
+
+
+@router.post("/admin/reload-model", response_model=ModelReloadResponse)
+async def reload_model(x_admin_token: Optional[str] = Header(None)):
+    _check_token(x_admin_token)
+    if not ml_model.MODEL_PATH.exists():
+        raise HTTPException(status_code=404, detail=f"Файл моделі не знайдено: {ml_model.MODEL_PATH.name}")
+
+    if _reload_lock.locked():
+        raise HTTPException(status_code=409, detail="Перезавантаження моделі вже виконується")
+
+    async with _reload_lock:
+        previous = ml_model.model_state.version if ml_model.model_state is not None else None
+        start = time.perf_counter()
+        try:
+            # The current model keeps serving while the new one loads and runs the warmup text.
+            state = await run_in_threadpool(ml_model.prepare_model, ml_model.MODEL_PATH)
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Нова модель не пройшла перевірку: {e}")
+
+        pool_reloaded = PREDICT_EXECUTION == "process" and worker_pool.executor is not None
+        if pool_reloaded:
+            try:
+                await worker_pool.swap_pool(ml_model.MODEL_PATH, state.version)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Не вдалося перезавантажити пул обробки: {e}")
+
+        ml_model.activate_model(state)
+
+    return ModelReloadResponse(
+        model_version=state.version,
+        previous_version=previous,
+        reload_seconds=round(time.perf_counter() - start, 3),
+        pool_reloaded=pool_reloaded,
+    )
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+import src.api.dependencies.ml_model as ml_model
+from src.api.schemas.health import ReadinessResponse
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+def readiness():
+    response = ReadinessResponse(
+        ready=ml_model.ready,
+        load_mode=ml_model.load_mode,
+        model_version=ml_model.model_version,
+        nlp_version=ml_model.nlp_version,
+        load_times=dict(ml_model.load_times),
+    )
+    if not response.ready:
+        return JSONResponse(status_code=503, content=response.model_dump())
+    return response
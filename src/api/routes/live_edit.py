@@ -0,0 +1,115 @@
+import asyncio
+import json
+from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+from src.api.dependencies.edit_session import EditSession, parse_paragraphs
+from src.api.dependencies.language import ensure_english
+from src.api.dependencies.worker_pool import run_in_pool
+from src.api.dependencies.log_writer import log_writer
+from src.api.routes.predict import _require_nlp, _require_clf, prediction_from_metrics
+from src.api.schemas.prediction import LiveEditResponse
+from src.core.sections import split_paragraphs
+from src.core.textnorm import normalize_text
+from src.config.api_config import (
+    PREDICT_EXECUTION, LONGDOC_SECTION_CHARS, LIVE_DEBOUNCE_SECONDS, LIVE_MAX_DELAY_SECONDS, LIVE_MAX_CHARS,
+)
+
+router = APIRouter(tags=["live"])
+
+async def _debounce(changed: asyncio.Event):
+    # returns once the client paused for LIVE_DEBOUNCE_SECONDS, or LIVE_MAX_DELAY_SECONDS after
+    # the first update of a burst
+    await changed.wait()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LIVE_MAX_DELAY_SECONDS
+    while True:
+        changed.clear()
+        timeout = min(LIVE_DEBOUNCE_SECONDS, deadline - loop.time())
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return
+
+async def score_update(session: EditSession, text: str, seq: Optional[int] = None) -> LiveEditResponse:
+    # Only paragraphs whose normalized text the session has not seen are parsed; the document
+    # metrics are recombined from the cached per-paragraph accumulators.
+    _require_nlp()
+    paragraphs = split_paragraphs(text)
+    if not paragraphs:
+        raise HTTPException(status_code=400, detail="Додайте текст!")
+    ensure_english(text[:LONGDOC_SECTION_CHARS])
+
+    norm_texts = [normalize_text(p) for p in paragraphs]
+    keys = [session.key(t) for t in norm_texts]
+    missing = session.missing(keys, norm_texts)
+    if missing:
+        if PREDICT_EXECUTION == "process":
+            parsed = await run_in_pool(parse_paragraphs, list(missing.values()))
+        else:
+            # off the event loop, so the debounce timers and the other connections keep running
+            parsed = await run_in_threadpool(parse_paragraphs, list(missing.values()))
+        session.store(dict(zip(missing, parsed)), keep=len(keys))
+
+    state = _require_clf()
+    response = prediction_from_metrics(state, session.combine(keys, norm_texts))
+    return LiveEditResponse(
+        **response.model_dump(),
+        seq=seq,
+        n_paragraphs=len(keys),
+        reparsed=len(missing),
+    )
+
+async def _scorer(websocket: WebSocket, session: EditSession, latest: Dict, changed: asyncio.Event):
+    while True:
+        await _debounce(changed)
+        text, seq = latest["text"], latest["seq"]
+        try:
+            response = await score_update(session, text, seq)
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "seq": seq, "detail": e.detail})
+            continue
+        except Exception as e:
+            await websocket.send_json({"type": "error", "seq": seq, "detail": f"Не вдалося обчислити метрики: {e}"})
+            continue
+        session.last_response, session.last_length = response, len(text)
+        await websocket.send_json(response.model_dump())
+
+@router.websocket("/ws/edit")
+async def live_edit(websocket: WebSocket):
+    # Client messages: {"text": <whole current text>, "seq": <optional client counter>}.
+    # Bursts are debounced, so only the latest text of a burst is scored and answered.
+    await websocket.accept()
+    session = EditSession()
+    latest: Dict = {"text": "", "seq": None}
+    changed = asyncio.Event()
+    scorer = asyncio.create_task(_scorer(websocket, session, latest, changed))
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict) or not isinstance(message.get("text"), str):
+                await websocket.send_json({"type": "error", "seq": None, "detail": "Очікується JSON з полем text"})
+                continue
+            seq = message.get("seq")
+            if len(message["text"]) > LIVE_MAX_CHARS:
+                await websocket.send_json({"type": "error", "seq": seq, "detail": f"Text is too long (max {LIVE_MAX_CHARS} symbols)"})
+                continue
+            latest["text"], latest["seq"] = message["text"], seq
+            changed.set()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        scorer.cancel()
+        if session.last_response is not None:
+            log_writer.submit(
+                level_id=session.last_response.level_id,
+                level_label=session.last_response.level_label,
+                text_length=session.last_length,
+                source_type="live_edit",
+            )
@@ -0,0 +1,47 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Form, HTTPException
+
+from src.api.dependencies.language import ensure_english, GATE_ON_DOC
+from src.api.dependencies.worker_pool import run_in_pool
+from src.api.routes.predict import parse_text
+from src.api.schemas.metrics import MetricsResponse, VerbPhraseItem
+from src.collector import features_from_doc
+from src.config.api_config import PREDICT_EXECUTION
+from src.config.feature_config import FEATURE_GROUPS
+from src.features.registry import resolve_features
+from src.features.verb_phrases import verb_phrases
+
+router = APIRouter(tags=["metrics"])
+
+
+def analyze_metrics(text: str, features: Optional[List[str]], with_verbs: bool = False) -> MetricsResponse:
+    if not GATE_ON_DOC:
+        ensure_english(text)
+    doc, norm_text = parse_text(text, check_language=GATE_ON_DOC)
+    # built before the features, so the morph extractors reuse the cached table
+    phrases = [VerbPhraseItem(**p._asdict()) for p in verb_phrases(doc)] if with_verbs else None
+    return MetricsResponse(metrics=features_from_doc(doc, norm_text, features), verb_phrases=phrases)
+
+
+@router.post("/metrics", response_model=MetricsResponse)
+async def text_metrics(
+    text: str = Form(None),
+    features: Optional[str] = Form(None),
+    verbs: bool = Form(False),
+):
+    if not text or not text.strip():
+        raise HTTPException(status_code=400, detail="Додайте текст!")
+
+    requested = [f.strip() for f in features.split(",") if f.strip()] if features else None
+    try:
+        resolve_features(requested)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if verbs and "morph" not in FEATURE_GROUPS:
+        raise HTTPException(status_code=400, detail="The verb breakdown needs the morph feature group")
+
+    if PREDICT_EXECUTION == "process":
+        return await run_in_pool(analyze_metrics, text, requested, verbs)
+    return analyze_metrics(text, requested, verbs)
@@ -1,90 +1,269 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import numpy as np
 from fastapi import APIRouter, Form, File, UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 import src.api.dependencies.ml_model as ml_model
-from src.api.dependencies.language import ensure_english
+from src.api.dependencies.language import ensure_english, GATE_ON_DOC
 from src.core.textnorm import normalize_text
-from src.features.lexical import extract_lexical
-from src.features.syntax import extract_syntax
-from src.features.morph import extract_morph
-from src.features.semantics import extract_semantics
-from src.features.readability import extract_readability
+from src.core.timing import timed
+from src.collector import features_from_doc, collect_sectioned_features
+from src.core.sections import split_sections
 from src.config.model_config import FEATURE_ORDER, ID2LEVEL
-from src.api.schemas.prediction import PredictionResponse
-from src.db.database import SessionLocal
-from src.db.models import AnalysisLog
+from src.features.requirements import group_features
+from src.config.api_config import (
+    PREDICT_BATCH_SIZE, PREDICT_BATCH_MAX_TEXTS, PREDICT_EXECUTION, LONGDOC_MAX_CHARS, LONGDOC_SECTION_CHARS,
+)
+from src.api.dependencies.worker_pool import run_in_pool
+from src.api.dependencies.prediction_cache import prediction_cache
+from src.api.schemas.prediction import (
+    PredictionResponse,
+    BatchPredictionRequest,
+    BatchPredictionItem,
+    BatchPredictionResponse,
+    SectionPrediction,
+    LongDocumentResponse,
+)
+from src.api.dependencies.log_writer import log_writer
 
 router = APIRouter(tags=["predict"])
 
-def compute_all_metrics(text: str) -> Dict[str, float]:
+MODEL_FEATURES = group_features(FEATURE_ORDER)
+
+def _require_nlp():
     if ml_model.nlp is None:
         raise HTTPException(
             status_code=500,
             detail="NLP-пайплайн не завантажений. Перезапустіть сервер або перевірте startup_event."
         )
 
-    norm_text = normalize_text(text)
-    doc = ml_model.nlp(norm_text)
-
-    metrics: Dict[str, float] = {}
-    metrics.update(extract_lexical(doc))
-    metrics.update(extract_syntax(doc))
-    metrics.update(extract_morph(doc))
-    metrics.update(extract_semantics(doc))
-    metrics.update(extract_readability(norm_text))
-
-    return metrics
-
-def predict_from_text(text: str) -> PredictionResponse:
-    if ml_model.clf is None:
+def _require_clf() -> ml_model.ModelState:
+    state = ml_model.model_state
+    if state is None:
         raise HTTPException(
             status_code=500,
             detail="Модель класифікації не завантажена. Перезапустіть сервер."
         )
+    return state
 
-    metrics = compute_all_metrics(text)
-    x = [metrics[name] for name in FEATURE_ORDER]
+def parse_text(text: str, check_language: bool = False):
+    _require_nlp()
 
-    pred_id = int(ml_model.clf.predict([x])[0])
-    level = ID2LEVEL.get(pred_id, "unknown")
+    with timed("normalize"):
+        norm_text = normalize_text(text)
+    with timed("spacy"):
+        doc = ml_model.nlp(norm_text)
+    if check_language:
+        ensure_english(text, doc)
+    return doc, norm_text
 
-    probabilities: Optional[Dict[str, float]] = None
-    if hasattr(ml_model.clf, "predict_proba"):
-        probs = ml_model.clf.predict_proba([x])[0]
+def compute_all_metrics(text: str, features: Optional[List[str]] = None,
+                        check_language: bool = False) -> Dict[str, float]:
+    doc, norm_text = parse_text(text, check_language)
+    return features_from_doc(doc, norm_text, features)
+
+def _probabilities(clf, probs) -> Dict[str, float]:
+    probabilities = {}
+    for class_id, p in zip(clf.classes_, probs):
+        label = ID2LEVEL.get(int(class_id), str(class_id))
+        probabilities[label] = float(p)
+    return probabilities
 
-        probabilities = {}
-        for class_id, p in zip(ml_model.clf.classes_, probs):
-            label = ID2LEVEL.get(int(class_id), str(class_id))
-            probabilities[label] = float(p)
+def _classify(clf, X: np.ndarray):
+    with timed("classifier"):
+        if hasattr(clf, "predict_proba"):
+            probs = clf.predict_proba(X)
+            return clf.classes_.take(np.argmax(probs, axis=1)), probs
+        return clf.predict(X), None
+
+def prediction_from_metrics(state: ml_model.ModelState, metrics: Dict[str, float]) -> PredictionResponse:
+    clf = state.clf
+    x = np.array([[metrics[name] for name in MODEL_FEATURES]], dtype=float)
+
+    probabilities: Optional[Dict[str, float]] = None
+    with timed("classifier"):
+        if hasattr(clf, "predict_proba"):
+            probs = clf.predict_proba(x)[0]
+            pred_id = int(clf.classes_[np.argmax(probs)])
+            probabilities = _probabilities(clf, probs)
+        else:
+            pred_id = int(clf.predict(x)[0])
+    level = ID2LEVEL.get(pred_id, "unknown")
 
     return PredictionResponse(
         level_id=pred_id,
         level_label=level,
         probabilities=probabilities,
         metrics=metrics,
+        model_version=state.version,
+    )
+
+def predict_from_text(text: str, check_language: bool = False) -> PredictionResponse:
+    state = _require_clf()
+    metrics = compute_all_metrics(text, check_language=check_language)
+    return prediction_from_metrics(state, metrics)
+
+def analyze_text(text: str) -> PredictionResponse:
+    if not GATE_ON_DOC:
+        ensure_english(text)
+    return predict_from_text(text, check_language=GATE_ON_DOC)
+
+async def _dispatch_analysis(text: str) -> PredictionResponse:
+    if PREDICT_EXECUTION == "process":
+        return await run_in_pool(analyze_text, text)
+    return analyze_text(text)
+
+async def run_analysis(text: str) -> PredictionResponse:
+    if not prediction_cache.enabled:
+        return await _dispatch_analysis(text)
+    key = prediction_cache.key(text)
+    return await prediction_cache.get_or_compute(key, lambda: _dispatch_analysis(text))
+
+def predict_batch(texts: List[str], batch_size: int = PREDICT_BATCH_SIZE) -> List[BatchPredictionItem]:
+    _require_nlp()
+    state = _require_clf()
+    clf = state.clf
+
+    errors: Dict[int, str] = {}
+    results: Dict[int, PredictionResponse] = {}
+    cache_keys: Dict[int, str] = {}
+    pending: List[int] = []
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            errors[i] = "Додайте текст!"
+            continue
+        if prediction_cache.enabled:
+            cache_keys[i] = prediction_cache.key(text)
+            cached = prediction_cache.get(cache_keys[i])
+            if cached is not None:
+                results[i] = cached
+                continue
+            prediction_cache.record_miss()
+        if not GATE_ON_DOC:
+            try:
+                ensure_english(text)
+            except HTTPException as e:
+                errors[i] = str(e.detail)
+                continue
+        pending.append(i)
+
+    norm_texts = [normalize_text(texts[i]) for i in pending]
+    docs = ml_model.nlp.pipe(norm_texts, batch_size=batch_size)
+
+    metrics_by_index: Dict[int, Dict[str, float]] = {}
+    for i, norm_text, doc in zip(pending, norm_texts, docs):
+        try:
+            if GATE_ON_DOC:
+                ensure_english(texts[i], doc)
+            metrics_by_index[i] = features_from_doc(doc, norm_text)
+        except HTTPException as e:
+            errors[i] = str(e.detail)
+        except Exception as e:
+            errors[i] = f"Не вдалося обчислити метрики: {e}"
+
+    ready = sorted(metrics_by_index)
+    if ready:
+        X = np.array(
+            [[metrics_by_index[i][name] for name in MODEL_FEATURES] for i in ready],
+            dtype=float,
+        )
+        pred_ids, probs = _classify(clf, X)
+
+        for row, i in enumerate(ready):
+            pred_id = int(pred_ids[row])
+            results[i] = PredictionResponse(
+                level_id=pred_id,
+                level_label=ID2LEVEL.get(pred_id, "unknown"),
+                probabilities=_probabilities(clf, probs[row]) if probs is not None else None,
+                metrics=metrics_by_index[i],
+                model_version=state.version,
+            )
+            if i in cache_keys:
+                prediction_cache.put(cache_keys[i], results[i])
+
+    return [
+        BatchPredictionItem(index=i, result=results.get(i), error=errors.get(i))
+        for i in range(len(texts))
+    ]
+
+def predict_long_text(text: str, with_sections: bool = False) -> LongDocumentResponse:
+    _require_nlp()
+    state = _require_clf()
+    clf = state.clf
+
+    sections = split_sections(text, LONGDOC_SECTION_CHARS)
+    if not sections:
+        raise HTTPException(status_code=400, detail="Документ пустий! Спробуйте ще раз")
+    ensure_english(sections[0])
+
+    metrics, section_metrics = collect_sectioned_features(
+        ml_model.nlp, sections, batch_size=PREDICT_BATCH_SIZE, keep_sections=with_sections,
+    )
+    rows = [metrics] + section_metrics
+    X = np.array([[m[name] for name in MODEL_FEATURES] for m in rows], dtype=float)
+    pred_ids, probs = _classify(clf, X)
+
+    def probabilities(row: int) -> Optional[Dict[str, float]]:
+        return _probabilities(clf, probs[row]) if probs is not None else None
+
+    pred_id = int(pred_ids[0])
+    return LongDocumentResponse(
+        level_id=pred_id,
+        level_label=ID2LEVEL.get(pred_id, "unknown"),
+        probabilities=probabilities(0),
+        metrics=metrics,
+        model_version=state.version,
+        n_sections=len(sections),
+        sections=[
+            SectionPrediction(
+                index=i,
+                n_chars=len(sections[i]),
+                level_id=int(pred_ids[i + 1]),
+                level_label=ID2LEVEL.get(int(pred_ids[i + 1]), "unknown"),
+                probabilities=probabilities(i + 1),
+                metrics=section_metrics[i],
+            )
+            for i in range(len(section_metrics))
+        ] if with_sections else None,
     )
 
+@router.post("/predict/batch", response_model=BatchPredictionResponse)
+def predict_level_batch(payload: BatchPredictionRequest):
+    if not payload.texts:
+        raise HTTPException(status_code=400, detail="Додайте хоча б один текст!")
+
+    if len(payload.texts) > PREDICT_BATCH_MAX_TEXTS:
+        raise HTTPException(status_code=400, detail=f"Too many texts in batch (max {PREDICT_BATCH_MAX_TEXTS})")
+
+    items = predict_batch(payload.texts)
+
+    for item in items:
+        if item.result is not None:
+            log_writer.submit(
+                level_id=item.result.level_id,
+                level_label=item.result.level_label,
+                text_length=len(payload.texts[item.index]),
+                source_type="batch",
+            )
+
+    return BatchPredictionResponse(items=items)
+
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_level(text: str = Form(None), file: UploadFile = File(None)):
     MIN_CHARS: int = 150
     MAX_CHARS: int = 8000
 
-    db = SessionLocal()
-
     if not text and not file:
         raise HTTPException(status_code=400, detail="Додайте текст або файл!")
 
     if text and text.strip():
-        ensure_english(text)
-        response = predict_from_text(text)
+        response = await run_analysis(text)
 
-        log = AnalysisLog(
+        log_writer.submit(
             level_id=response.level_id,
             level_label=response.level_label,
             text_length=len(text),
             source_type="text",
         )
-        db.add(log)
-        db.commit()
         return response
 
 
@@ -110,16 +289,47 @@ async def predict_level(text: str = Form(None), file: UploadFile = File(None)):
     if not file_text.strip():
         raise HTTPException(status_code=400, detail="Файл не містить зрозумілий текст")
 
-    ensure_english(file_text)
+    response = await run_analysis(file_text)
 
-    response = predict_from_text(file_text)
-
-    log = AnalysisLog(
+    log_writer.submit(
         level_id=response.level_id,
         level_label=response.level_label,
         text_length=len(file_text),
         source_type="file",
     )
-    db.add(log)
-    db.commit()
-    return response
\ No newline at end of file
+    return response
+
+@router.post("/predict/long", response_model=LongDocumentResponse)
+async def predict_long_document(
+    text: str = Form(None),
+    file: UploadFile = File(None),
+    sections: bool = Form(False),
+):
+    if text and text.strip():
+        source_type = "long_text"
+    elif file is not None:
+        if file.content_type not in ("text/plain", "application/octet-stream"):
+            raise HTTPException(status_code=400, detail="Підтримуються лише файли з розширенням .txt")
+        text = (await file.read()).decode("utf-8", errors="ignore")
+        source_type = "long_file"
+    else:
+        raise HTTPException(status_code=400, detail="Додайте текст або файл!")
+
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Файл не містить зрозумілий текст")
+    if len(text) > LONGDOC_MAX_CHARS:
+        raise HTTPException(status_code=400, detail=f"Text is too long (max {LONGDOC_MAX_CHARS} symbols)")
+
+    if PREDICT_EXECUTION == "process":
+        response = await run_in_pool(predict_long_text, text, sections)
+    else:
+        # up to LONGDOC_MAX_CHARS of parsing; off the event loop so other requests keep being served
+        response = await run_in_threadpool(predict_long_text, text, sections)
+
+    log_writer.submit(
+        level_id=response.level_id,
+        level_label=response.level_label,
+        text_length=len(text),
+        source_type=source_type,
+    )
+    return response
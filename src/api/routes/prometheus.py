@@ -0,0 +1,35 @@
+from typing import Dict, Iterator
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+import src.api.dependencies.ml_model as ml_model
+import src.api.dependencies.worker_pool as worker_pool
+from src.api.dependencies.instrumentation import request_seconds
+from src.api.dependencies.log_writer import log_writer
+from src.api.dependencies.prediction_cache import prediction_cache
+from src.core.timing import stage_seconds
+
+router = APIRouter(tags=["monitoring"])
+
+# stats() keys that only ever increase; everything else is a point-in-time value
+COUNTERS = frozenset({"hits", "misses", "disk_hits", "coalesced", "evictions",
+                      "enqueued", "flushed", "dropped", "failed", "batches"})
+
+def _stat_metrics(prefix: str, values: Dict[str, int]) -> Iterator[str]:
+    for key, value in values.items():
+        if key in COUNTERS:
+            name = f"{prefix}_{key}_total"
+            yield f"# TYPE {name} counter"
+        else:
+            name = f"{prefix}_{key}"
+            yield f"# TYPE {name} gauge"
+        yield f"{name} {value}"
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    # Prometheus text exposition format (version 0.0.4)
+    lines = list(stage_seconds.render())
+    lines += request_seconds.render()
+    lines += _stat_metrics("text_complexity", {"ready": int(ml_model.ready), "pool_pending": worker_pool.pending})
+    lines += _stat_metrics("text_complexity_prediction_cache", prediction_cache.stats())
+    lines += _stat_metrics("text_complexity_log_writer", log_writer.stats())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -1,55 +1,168 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from src.api.schemas.stats import StatsResponse, LevelStats
+from src.api.schemas.stats import (
+    StatsResponse, LevelStats, SourceStats, StatsBucket, CacheStatsResponse, LogWriterStatsResponse,
+)
+from src.api.dependencies.prediction_cache import prediction_cache
+from src.api.dependencies.log_writer import log_writer
 from src.config.model_config import ID2LEVEL
 from src.db.database import SessionLocal
-from src.db.models import AnalysisLog
+from src.db.models import AnalysisLog, AnalysisRollup
+from src.db.rollups import bucket_start
 
 router = APIRouter(tags=["stats"])
 
+BUCKETS = ("hour", "day")
 
-@router.get("/stats", response_model=StatsResponse)
-def get_stats():
-    db: Session = SessionLocal()
-    try:
-        total = db.query(func.count(AnalysisLog.id)).scalar() or 0
+# (hour, level_id, source_type, count, text_length_sum)
+Counter = Tuple[Optional[datetime], int, str, int, int]
 
-        if total == 0:
-            return StatsResponse(
-                total_count=0,
-                avg_text_length=0.0,
-                levels=[],
-            )
 
-        avg_len = db.query(func.avg(AnalysisLog.text_length)).scalar() or 0.0
+def _naive_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is not None and ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _ceil_hour(ts: datetime) -> datetime:
+    floor = bucket_start(ts)
+    return floor if floor == ts else floor + timedelta(hours=1)
+
 
+def _counters(db: Session, start: Optional[datetime], end: Optional[datetime], by_hour: bool) -> List[Counter]:
+    # Whole hours are read from the analysis_rollups counters; the partial hours at the
+    # edges of an unaligned range come from analysis_logs through the created_at index.
+    full_start = _ceil_hour(start) if start is not None else None
+    full_end = bucket_start(end) if end is not None else None
+    counters: List[Counter] = []
+    edges: List[Tuple[datetime, datetime]] = []
+    if full_start is not None and full_end is not None and full_start >= full_end:
+        # no whole hour in between: one partial hour, or two split at the hour boundary
+        split = max(start, full_end)
+        edges.extend((lo, hi) for lo, hi in ((start, split), (split, end)) if lo < hi)
+    else:
+        if start is not None and start < full_start:
+            edges.append((start, full_start))
+        if end is not None and full_end < end:
+            edges.append((full_end, end))
+
+        cols = [AnalysisRollup.bucket_start] if by_hour else []
+        q = db.query(
+            *cols,
+            AnalysisRollup.level_id,
+            AnalysisRollup.source_type,
+            func.sum(AnalysisRollup.log_count),
+            func.sum(AnalysisRollup.text_length_sum),
+        )
+        if full_start is not None:
+            q = q.filter(AnalysisRollup.bucket_start >= full_start)
+        if full_end is not None:
+            q = q.filter(AnalysisRollup.bucket_start < full_end)
+        rows = q.group_by(*cols, AnalysisRollup.level_id, AnalysisRollup.source_type).all()
+        counters.extend((r[0] if by_hour else None, *r[-4:]) for r in rows)
+
+    for lo, hi in edges:
         rows = (
-            db.query(AnalysisLog.level_id, func.count(AnalysisLog.id))
-            .group_by(AnalysisLog.level_id)
+            db.query(
+                AnalysisLog.level_id,
+                AnalysisLog.source_type,
+                func.count(AnalysisLog.id),
+                func.sum(AnalysisLog.text_length),
+            )
+            .filter(AnalysisLog.created_at >= lo, AnalysisLog.created_at < hi)
+            .group_by(AnalysisLog.level_id, AnalysisLog.source_type)
             .all()
         )
+        hour = bucket_start(lo) if by_hour else None
+        counters.extend((hour, *r) for r in rows)
+    return counters
 
-        levels: List[LevelStats] = []
-        for level_id, count in rows:
-            label = ID2LEVEL.get(int(level_id), str(level_id))
-            share = count / total
-            levels.append(
-                LevelStats(
-                    level_id=int(level_id),
-                    level_label=label,
-                    count=count,
-                    share=share,
-                )
-            )
 
-        return StatsResponse(
-            total_count=total,
-            avg_text_length=float(avg_len),
-            levels=levels,
+def _level_stats(counts: Dict[int, int], total: int) -> List[LevelStats]:
+    return [
+        LevelStats(
+            level_id=level_id,
+            level_label=ID2LEVEL.get(level_id, str(level_id)),
+            count=count,
+            share=count / total,
         )
+        for level_id, count in sorted(counts.items())
+    ]
+
+
+@router.get("/stats", response_model=StatsResponse)
+def get_stats(start: Optional[datetime] = None, end: Optional[datetime] = None, bucket: Optional[str] = None):
+    if bucket is not None and bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Параметр bucket має бути одним із: {', '.join(BUCKETS)}")
+    start, end = _naive_utc(start), _naive_utc(end)
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(status_code=400, detail="Параметр start має бути раніше за end")
+
+    db: Session = SessionLocal()
+    try:
+        counters = _counters(db, start, end, by_hour=bucket is not None)
     finally:
         db.close()
+
+    total = 0
+    length_sum = 0
+    levels: Dict[int, int] = {}
+    sources: Dict[str, int] = {}
+    series: Dict[datetime, List[Counter]] = {}
+    for hour, level_id, source_type, count, text_length in counters:
+        count, text_length = int(count or 0), int(text_length or 0)
+        if not count:
+            continue
+        total += count
+        length_sum += text_length
+        levels[int(level_id)] = levels.get(int(level_id), 0) + count
+        sources[source_type] = sources.get(source_type, 0) + count
+        if hour is not None:
+            key = hour.replace(hour=0) if bucket == "day" else hour
+            series.setdefault(key, []).append((hour, int(level_id), source_type, count, text_length))
+
+    buckets = None
+    if bucket is not None:
+        buckets = []
+        for key in sorted(series):
+            b_total = sum(c[3] for c in series[key])
+            b_levels: Dict[int, int] = {}
+            for c in series[key]:
+                b_levels[c[1]] = b_levels.get(c[1], 0) + c[3]
+            buckets.append(
+                StatsBucket(
+                    bucket_start=key,
+                    total_count=b_total,
+                    avg_text_length=sum(c[4] for c in series[key]) / b_total,
+                    levels=_level_stats(b_levels, b_total),
+                )
+            )
+
+    return StatsResponse(
+        total_count=total,
+        avg_text_length=length_sum / total if total else 0.0,
+        levels=_level_stats(levels, total) if total else [],
+        sources=[
+            SourceStats(source_type=source_type, count=count, share=count / total)
+            for source_type, count in sorted(sources.items())
+        ],
+        start=start,
+        end=end,
+        bucket=bucket,
+        buckets=buckets,
+    )
+
+
+@router.get("/stats/cache", response_model=CacheStatsResponse)
+def get_cache_stats():
+    return CacheStatsResponse(**prediction_cache.stats())
+
+
+@router.get("/stats/logs", response_model=LogWriterStatsResponse)
+def get_log_writer_stats():
+    return LogWriterStatsResponse(**log_writer.stats())
@@ -0,0 +1,10 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ModelReloadResponse(BaseModel):
+    model_version: str
+    previous_version: Optional[str] = None
+    reload_seconds: float
+    pool_reloaded: bool
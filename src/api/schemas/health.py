@@ -0,0 +1,11 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    load_mode: Optional[str] = None
+    model_version: Optional[str] = None
+    nlp_version: Optional[str] = None
+    load_times: Dict[str, float]
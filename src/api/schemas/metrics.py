@@ -0,0 +1,21 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class VerbPhraseItem(BaseModel):
+    i: int
+    text: str
+    lemma: str
+    pos: str
+    tag: str
+    tense: Optional[str] = None
+    aspect: Optional[str] = None
+    future: bool
+    modal: Optional[str] = None
+    auxiliaries: List[str]
+
+
+class MetricsResponse(BaseModel):
+    metrics: Dict[str, float]
+    verb_phrases: Optional[List[VerbPhraseItem]] = None
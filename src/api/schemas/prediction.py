@@ -6,3 +6,33 @@ class PredictionResponse(BaseModel):
     level_label: str
     probabilities: Optional[Dict[str, float]] = None
     metrics: Optional[Dict[str, float]] = None
+    model_version: Optional[str] = None
+
+class BatchPredictionRequest(BaseModel):
+    texts: List[str]
+
+class BatchPredictionItem(BaseModel):
+    index: int
+    result: Optional[PredictionResponse] = None
+    error: Optional[str] = None
+
+class BatchPredictionResponse(BaseModel):
+    items: List[BatchPredictionItem]
+
+class SectionPrediction(BaseModel):
+    index: int
+    n_chars: int
+    level_id: int
+    level_label: str
+    probabilities: Optional[Dict[str, float]] = None
+    metrics: Optional[Dict[str, float]] = None
+
+class LongDocumentResponse(PredictionResponse):
+    n_sections: int
+    sections: Optional[List[SectionPrediction]] = None
+
+class LiveEditResponse(PredictionResponse):
+    type: str = "prediction"
+    seq: Optional[int] = None
+    n_paragraphs: int
+    reparsed: int
@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -10,7 +11,46 @@ class LevelStats(BaseModel):
     share: float
 
 
+class SourceStats(BaseModel):
+    source_type: str
+    count: int
+    share: float
+
+
+class StatsBucket(BaseModel):
+    bucket_start: datetime
+    total_count: int
+    avg_text_length: float
+    levels: List[LevelStats]
+
+
 class StatsResponse(BaseModel):
     total_count: int
     avg_text_length: float
     levels: List[LevelStats]
+    sources: List[SourceStats] = []
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    bucket: Optional[str] = None
+    buckets: Optional[List[StatsBucket]] = None
+
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    disk_hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    inflight: int
+
+
+class LogWriterStatsResponse(BaseModel):
+    queued: int
+    max_queue: int
+    enqueued: int
+    flushed: int
+    dropped: int
+    failed: int
+    batches: int
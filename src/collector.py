@@ -1,22 +1,68 @@
-from typing import Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from src.core.textnorm import normalize_text
 from src.core.spacy_nlp import load_spacy_nlp
-from src.features.lexical import extract_lexical
-from src.features.syntax import extract_syntax
-from src.features.morph import extract_morph
-from src.features.semantics import extract_semantics
+from src.features.columnar import extract_columnar
+from src.features.accumulators import FeatureAccumulator
 from src.features.readability import extract_readability
+from src.features.registry import extract_features, feature_groups, resolve_features
+from src.features.requirements import pipeline_requirements
+from src.features.shared import release
+from src.core.timing import timed
+from src.config.feature_config import FEATURE_ENGINE, FEATURE_GROUPS, READABILITY_ENGINE
 
-def collect_all_features(text: str, spacy_model: str = "en_core_web_md") -> Dict[str, float]:
+def features_from_doc(doc, norm_text: str, features: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    if FEATURE_ENGINE == "columnar":
+        names = resolve_features(features)
+        try:
+            with timed("columnar"):
+                metrics = extract_columnar(doc, norm_text, feature_groups(names))
+        finally:
+            release(doc)
+        return {name: metrics[name] for name in names}
+
+    return extract_features(doc, features)
+
+def collect_all_features(text: str, spacy_model: str = "en_core_web_md",
+                         features: Optional[Iterable[str]] = None) -> Dict[str, float]:
     norm_text = normalize_text(text)
-    nlp = load_spacy_nlp(spacy_model)
+    nlp = load_spacy_nlp(spacy_model, pipeline_requirements())
     doc = nlp(norm_text)
 
-    metrics = {}
-    metrics.update(extract_lexical(doc))
-    metrics.update(extract_syntax(doc))
-    metrics.update(extract_morph(doc))
-    metrics.update(extract_semantics(doc))
-    metrics.update(extract_readability(norm_text))
+    return features_from_doc(doc, norm_text, features)
+
+def collect_features_stream(items: Iterable[Tuple[str, Any]], spacy_model: str = "en_core_web_md",
+                            features: Optional[Iterable[str]] = None, batch_size: int = 64,
+                            n_process: int = 1) -> Iterator[Tuple[Dict[str, float], Any]]:
+    # Parses (text, context) pairs with nlp.pipe and yields (metrics, context) in input order.
+    nlp = load_spacy_nlp(spacy_model, pipeline_requirements())
+    def normed():
+        for text, ctx in items:
+            norm_text = normalize_text(text)
+            yield norm_text, (norm_text, ctx)
+
+    for doc, (norm_text, ctx) in nlp.pipe(normed(), as_tuples=True, batch_size=batch_size, n_process=n_process):
+        yield features_from_doc(doc, norm_text, features), ctx
+
+def accumulate_sections(nlp, norm_texts: List[str], batch_size: int = 64) -> Iterator[FeatureAccumulator]:
+    # Each Doc is folded into its FeatureAccumulator before the next one is parsed.
+    for doc in nlp.pipe(norm_texts, batch_size=batch_size):
+        yield FeatureAccumulator.from_doc(doc)
+
+def accumulated_metrics(acc: FeatureAccumulator, norm_text: str) -> Dict[str, float]:
+    # The textstat engine scores the (joined) normalized text instead of the merged counts.
+    metrics = acc.metrics()
+    if "readability" in FEATURE_GROUPS and READABILITY_ENGINE == "textstat":
+        metrics.update(extract_readability(norm_text))
+    return metrics
 
-    return metrics
\ No newline at end of file
+def collect_sectioned_features(nlp, sections: List[str], batch_size: int = 64,
+                               keep_sections: bool = False) -> Tuple[Dict[str, float], List[Dict[str, float]]]:
+    # Long-document mode: returns the whole-text metrics and, if asked, those of every section.
+    norm_texts = [normalize_text(s) for s in sections]
+    total = FeatureAccumulator()
+    per_section: List[Dict[str, float]] = []
+    for norm_text, acc in zip(norm_texts, accumulate_sections(nlp, norm_texts, batch_size)):
+        if keep_sections:
+            per_section.append(accumulated_metrics(acc, norm_text))
+        total.merge(acc)
+    return accumulated_metrics(total, " ".join(norm_texts)), per_section
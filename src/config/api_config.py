@@ -0,0 +1,63 @@
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PREDICT_BATCH_SIZE: int = int(os.getenv("PREDICT_BATCH_SIZE", "64"))
+PREDICT_BATCH_MAX_TEXTS: int = int(os.getenv("PREDICT_BATCH_MAX_TEXTS", "1000"))
+
+# "inline" runs analysis on the event loop thread, "process" hands it to a preloaded process pool
+PREDICT_EXECUTION: str = os.getenv("PREDICT_EXECUTION", "inline")
+PREDICT_POOL_WORKERS: int = int(os.getenv("PREDICT_POOL_WORKERS", str(os.cpu_count() or 1)))
+PREDICT_POOL_MAX_PENDING: int = int(os.getenv("PREDICT_POOL_MAX_PENDING", "64"))
+
+# 0 disables the prediction cache; an empty PREDICT_CACHE_DIR keeps it in memory only
+PREDICT_CACHE_SIZE: int = int(os.getenv("PREDICT_CACHE_SIZE", "2048"))
+PREDICT_CACHE_DIR: str = os.getenv("PREDICT_CACHE_DIR", "")
+
+# "pickle" unpickles the forest and loads the packaged vectors in every process; "mmap" maps both
+# from SHARED_MODEL_DIR (src/scripts/export_shared_resources.py) so workers share the pages
+MODEL_LOAD_MODE: str = os.getenv("MODEL_LOAD_MODE", "pickle")
+SHARED_MODEL_DIR: Path = Path(os.getenv("SHARED_MODEL_DIR", str(Path(__file__).resolve().parents[2] / "models" / "shared")))
+# run a synthetic text through the whole pipeline before reporting ready (always on in mmap mode)
+STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "0") == "1" or MODEL_LOAD_MODE == "mmap"
+# "sklearn" predicts with the unpickled RandomForestClassifier, "flat" compiles it into FlatForest arrays
+# (always flat in mmap mode)
+FOREST_ENGINE: str = os.getenv("FOREST_ENGINE", "sklearn")
+
+# background AnalysisLog writer: queue bound (rows beyond it are dropped), rows per insert
+# and the longest a queued row waits before it is flushed
+LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_FLUSH_SIZE: int = int(os.getenv("LOG_FLUSH_SIZE", "500"))
+LOG_FLUSH_INTERVAL: float = float(os.getenv("LOG_FLUSH_INTERVAL", "1.0"))
+
+# token expected in the X-Admin-Token header of /api/admin/* endpoints; empty disables them
+ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+# /api/predict/long: largest accepted document and the size of the sections it is analyzed in
+LONGDOC_MAX_CHARS: int = int(os.getenv("LONGDOC_MAX_CHARS", "2000000"))
+LONGDOC_SECTION_CHARS: int = int(os.getenv("LONGDOC_SECTION_CHARS", "4000"))
+
+# /api/ws/edit: an update is scored once the client pauses for LIVE_DEBOUNCE_SECONDS, but at least
+# every LIVE_MAX_DELAY_SECONDS while it keeps typing; parsed paragraphs kept per connection
+LIVE_DEBOUNCE_SECONDS: float = float(os.getenv("LIVE_DEBOUNCE_SECONDS", "0.3"))
+LIVE_MAX_DELAY_SECONDS: float = float(os.getenv("LIVE_MAX_DELAY_SECONDS", "2.0"))
+LIVE_SESSION_PARAGRAPHS: int = int(os.getenv("LIVE_SESSION_PARAGRAPHS", "1000"))
+LIVE_MAX_CHARS: int = int(os.getenv("LIVE_MAX_CHARS", "200000"))
+
+# opt-in sampling profiler (pyinstrument) for slow requests: a PROFILE_SAMPLE_RATE share of requests
+# runs under it and the profiles of those that took at least PROFILE_SLOW_MS are written to PROFILE_DIR;
+# 0 disables it
+PROFILE_SLOW_MS: float = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_INTERVAL: float = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+PROFILE_DIR: Path = Path(os.getenv("PROFILE_DIR", str(Path(__file__).resolve().parents[2] / "logs" / "profiles")))
+
+# "langdetect" runs langdetect over the whole text; "fast" decides from the English stopword share
+# (and OOV share, given vectors) of a bounded sample, on the parsed Doc where one is parsed anyway,
+# and leaves only unclear samples to langdetect
+LANGUAGE_GATE: str = os.getenv("LANGUAGE_GATE", "langdetect")
+LANGUAGE_SAMPLE_CHARS: int = int(os.getenv("LANGUAGE_SAMPLE_CHARS", "2000"))
+LANGUAGE_SAMPLE_TOKENS: int = int(os.getenv("LANGUAGE_SAMPLE_TOKENS", "400"))
+LANGUAGE_MIN_STOP_SHARE: float = float(os.getenv("LANGUAGE_MIN_STOP_SHARE", "0.3"))
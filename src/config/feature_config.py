@@ -0,0 +1,30 @@
+import os
+from pathlib import Path
+from typing import List
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# "classic" runs the per-group extractors, "columnar" the single-pass Doc.to_array engine
+FEATURE_ENGINE: str = os.getenv("FEATURE_ENGINE", "classic")
+
+# memory-mapped lemma -> zipf table built by src/scripts/build_zipf_table.py
+ZIPF_TABLE_DIR: Path = Path(os.getenv("ZIPF_TABLE_DIR", str(PROJECT_ROOT / "assets" / "zipf")))
+
+# memory-mapped (lemma, POS) -> (synset count, hypernym depth) table built by src/scripts/build_wordnet_table.py
+WORDNET_TABLE_DIR: Path = Path(os.getenv("WORDNET_TABLE_DIR", str(PROJECT_ROOT / "assets" / "wordnet")))
+
+# "textstat" scores the normalized text, "doc" reuses the parsed Doc and the shared syllable cache
+READABILITY_ENGINE: str = os.getenv("READABILITY_ENGINE", "textstat")
+
+# feature groups computed at runtime; the spaCy pipeline is trimmed to what they need
+FEATURE_GROUPS: List[str] = [g.strip() for g in os.getenv("FEATURE_GROUPS", "lexical,syntax,morph,semantics,readability").split(",") if g.strip()]
+
+# memory-mapped copy of the metrics table used for training, kept in sync by src/scripts/sync_feature_store.py
+FEATURE_STORE_DIR: Path = Path(os.getenv("FEATURE_STORE_DIR", str(PROJECT_ROOT / "data" / "feature_store")))
+
+# fill the lemma -> affix morpheme memo for every word of the spaCy vectors table when the API loads
+# (more memory per process; covers nothing when the pipeline is loaded without vectors)
+MORPHEME_PRECOMPUTE: bool = os.getenv("MORPHEME_PRECOMPUTE", "0") == "1"
@@ -0,0 +1,45 @@
+from typing import Dict, Iterable, Optional
+
+# marks the end of a key; never a single character
+END = ""
+
+class AffixTrie:
+    def __init__(self, keys: Iterable[str]):
+        self.root: Dict[str, dict] = {}
+        for key in keys:
+            node = self.root
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[END] = {}
+
+    def shortest_match(self, chars: str) -> Optional[int]:
+        # length of the shortest key that chars starts with
+        node = self.root
+        if END in node:
+            return 0
+        for depth, ch in enumerate(chars, 1):
+            node = node.get(ch)
+            if node is None:
+                return None
+            if END in node:
+                return depth
+        return None
+
+class AffixMatcher:
+    # Prefix trie plus a trie of the reversed suffixes. An affix counts as a morpheme only when the
+    # word is more than two characters longer than it, so the shortest match at each end decides,
+    # and a walk never goes deeper than len(word) - 3 characters.
+    def __init__(self, prefixes: Iterable[str], suffixes: Iterable[str]):
+        self.prefixes = AffixTrie(prefixes)
+        self.suffixes = AffixTrie(s[::-1] for s in suffixes)
+
+    def count(self, word: str) -> int:
+        longest = len(word) - 3
+        if longest < 0:
+            return 0
+        n = 0
+        if self.prefixes.shortest_match(word[:longest]) is not None:
+            n += 1
+        if self.suffixes.shortest_match(word[::-1][:longest]) is not None:
+            n += 1
+        return n
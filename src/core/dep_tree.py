@@ -0,0 +1,68 @@
+from typing import Optional
+import numpy as np
+from spacy.tokens import Doc
+from spacy.attrs import HEAD, SENT_START
+
+class DepTree:
+    # Tree statistics over absolute head indices (heads[i] == i for roots), computed level by
+    # level from the roots: O(n) overall, no recursion and no per-token Python objects.
+    def __init__(self, heads: np.ndarray, sent_id: Optional[np.ndarray] = None):
+        self.n = len(heads)
+        self.heads = heads.astype(np.int64)
+        self.idx = np.arange(self.n, dtype=np.int64)
+        self.is_root = self.heads == self.idx
+        self.sent_id = sent_id
+
+        # 1 for roots, 0 for tokens that no root reaches (only possible with a malformed parse)
+        self.depth = np.zeros(self.n, dtype=np.int64)
+        self.root = np.full(self.n, -1, dtype=np.int64)
+        self.subtree_size = np.ones(self.n, dtype=np.int64)
+
+        child = np.flatnonzero(~self.is_root)
+        child = child[np.argsort(self.heads[child], kind="stable")]
+        n_children = np.bincount(self.heads[child], minlength=self.n)
+        first_child = np.cumsum(n_children) - n_children
+
+        levels = []
+        frontier = np.flatnonzero(self.is_root)
+        self.root[frontier] = frontier
+        level = 1
+        while len(frontier):
+            self.depth[frontier] = level
+            levels.append(frontier)
+            counts = n_children[frontier]
+            total = int(counts.sum())
+            if not total:
+                break
+            offsets = np.repeat(first_child[frontier] - (np.cumsum(counts) - counts), counts)
+            frontier = child[offsets + np.arange(total)]
+            self.root[frontier] = self.root[self.heads[frontier]]
+            level += 1
+
+        for nodes in reversed(levels[1:]):
+            np.add.at(self.subtree_size, self.heads[nodes], self.subtree_size[nodes])
+
+    @classmethod
+    def from_doc(cls, doc: Doc) -> "DepTree":
+        arr = doc.to_array([HEAD, SENT_START]).reshape(-1, 2)
+        heads = np.arange(len(doc), dtype=np.int64) + arr[:, 0].astype(np.int64)
+        starts = arr[:, 1].astype(np.int64) == 1
+        if len(doc):
+            starts[0] = True
+        return cls(heads, np.cumsum(starts) - 1)
+
+    @property
+    def n_sents(self) -> int:
+        if self.sent_id is None or not self.n:
+            return 0
+        return int(self.sent_id[-1]) + 1
+
+    def sentence_max_depth(self) -> np.ndarray:
+        # Deepest tree rooted in each sentence; 0 for sentences without a root.
+        out = np.zeros(self.n_sents, dtype=np.int64)
+        reached = self.root >= 0
+        np.maximum.at(out, self.sent_id[self.root[reached]], self.depth[reached])
+        return out
+
+    def sentence_has_root(self) -> np.ndarray:
+        return np.bincount(self.sent_id[self.is_root], minlength=self.n_sents) > 0
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from src.config.model_config import FEATURE_ORDER
+from src.db.models import Metrics
+
+X_FILE = "X.f32"
+Y_FILE = "y.i32"
+IDS_FILE = "ids.i64"
+META_FILE = "meta.json"
+
+class FeatureStore:
+    # The metrics table as fixed-width column files: X is float32 (rows, features) in FEATURE_ORDER,
+    # y the level ids, ids the metrics.id of every row. NULL metrics are stored as NaN.
+    def __init__(self, X: np.ndarray, y: np.ndarray, ids: np.ndarray, meta: Dict):
+        self.X = X
+        self.y = y
+        self.ids = ids
+        self.meta = meta
+        self.features: List[str] = list(meta["features"])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def max_id(self) -> int:
+        return int(self.meta.get("max_id", 0))
+
+    @staticmethod
+    def exists(store_dir: Path) -> bool:
+        return all((store_dir / f).exists() for f in (X_FILE, Y_FILE, IDS_FILE, META_FILE))
+
+    @classmethod
+    def open(cls, store_dir: Path, mmap_mode: str = "r") -> "FeatureStore":
+        meta = json.loads((store_dir / META_FILE).read_text(encoding="utf-8"))
+        rows = int(meta["rows"])
+
+        def arr(name: str, dtype, shape) -> np.ndarray:
+            if not rows:
+                return np.empty(shape, dtype=dtype)
+            return np.memmap(store_dir / name, dtype=dtype, mode=mmap_mode, shape=shape)
+
+        return cls(
+            arr(X_FILE, np.float32, (rows, len(meta["features"]))),
+            arr(Y_FILE, np.int32, (rows,)),
+            arr(IDS_FILE, np.int64, (rows,)),
+            meta,
+        )
+
+def _read_meta(store_dir: Path) -> Optional[Dict]:
+    if not FeatureStore.exists(store_dir):
+        return None
+    return json.loads((store_dir / META_FILE).read_text(encoding="utf-8"))
+
+def _write_meta(store_dir: Path, meta: Dict):
+    tmp = store_dir / (META_FILE + ".tmp")
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    tmp.replace(store_dir / META_FILE)
+
+def sync_feature_store(engine: Engine, store_dir: Path, rebuild: bool = False, chunk_size: int = 10000) -> int:
+    # Appends metrics rows with id > meta["max_id"]; updates and deletes of older rows need rebuild=True.
+    # meta.json is replaced only after the column files are flushed, so an interrupted sync leaves
+    # unreferenced bytes at the end of the files, which the next sync truncates.
+    meta = None if rebuild else _read_meta(store_dir)
+    if meta is not None and meta["features"] != FEATURE_ORDER:
+        raise ValueError(f"Feature store at {store_dir} was built for a different FEATURE_ORDER; sync with rebuild=True")
+    if meta is None:
+        meta = {"features": list(FEATURE_ORDER), "rows": 0, "max_id": 0}
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    n_features = len(FEATURE_ORDER)
+    rows = int(meta["rows"])
+    widths = {X_FILE: 4 * n_features, Y_FILE: 4, IDS_FILE: 8}
+    files = {}
+    for name, width in widths.items():
+        f = open(store_dir / name, "r+b" if (store_dir / name).exists() else "w+b")
+        f.truncate(rows * width)
+        f.seek(rows * width)
+        files[name] = f
+
+    cols = [Metrics.id, Metrics.level_id] + [getattr(Metrics, name) for name in FEATURE_ORDER]
+    stmt = select(*cols).where(Metrics.id > int(meta["max_id"])).order_by(Metrics.id)
+    added = 0
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+            for chunk in result.partitions(chunk_size):
+                block = np.array([tuple(r) for r in chunk], dtype=np.float64)
+                files[IDS_FILE].write(block[:, 0].astype(np.int64).tobytes())
+                files[Y_FILE].write(block[:, 1].astype(np.int32).tobytes())
+                files[X_FILE].write(np.ascontiguousarray(block[:, 2:], dtype=np.float32).tobytes())
+                added += len(block)
+                meta["max_id"] = int(block[-1, 0])
+    finally:
+        for f in files.values():
+            f.flush()
+            f.close()
+
+    meta["rows"] = rows + added
+    _write_meta(store_dir, meta)
+    return added
+
+def load_feature_store(store_dir: Path) -> FeatureStore:
+    if not FeatureStore.exists(store_dir):
+        raise FileNotFoundError(f"No feature store at {store_dir}; run src/scripts/sync_feature_store.py")
+    store = FeatureStore.open(store_dir)
+    if store.features != FEATURE_ORDER:
+        raise ValueError(f"Feature store at {store_dir} was built for a different FEATURE_ORDER; rebuild it")
+    return store
@@ -0,0 +1,132 @@
+import json
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+
+LEFT_FILE = "children_left.npy"
+RIGHT_FILE = "children_right.npy"
+FEATURE_FILE = "feature.npy"
+THRESHOLD_FILE = "threshold.npy"
+MISSING_FILE = "missing_go_to_left.npy"
+PROBA_FILE = "leaf_proba.npy"
+ROOTS_FILE = "roots.npy"
+CLASSES_FILE = "classes.npy"
+META_FILE = "meta.json"
+
+class FlatForest:
+    # A fitted RandomForestClassifier as contiguous node arrays over all trees. Child indices
+    # are global (tree offset included), -1 marks a leaf. Arrays may be read-only memmaps.
+    # missing_go_to_left: where a NaN goes at each split, as in sklearn >= 1.3 trees.
+    def __init__(self, left: np.ndarray, right: np.ndarray, feature: np.ndarray, threshold: np.ndarray,
+                 missing_go_to_left: np.ndarray, leaf_proba: np.ndarray, roots: np.ndarray, classes: np.ndarray,
+                 meta: Optional[Dict] = None):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_go_to_left = missing_go_to_left
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.classes_ = classes
+        self.meta = meta or {}
+        self.n_classes_ = len(classes)
+        self.n_features_in_ = int(self.meta.get("n_features_in", int(np.max(feature, initial=-1)) + 1))
+
+    @classmethod
+    def from_sklearn(cls, forest, meta: Optional[Dict] = None) -> "FlatForest":
+        trees = [est.tree_ for est in forest.estimators_]
+        sizes = np.array([t.node_count for t in trees], dtype=np.int64)
+        offsets = np.cumsum(sizes) - sizes
+
+        def children(attr: str) -> np.ndarray:
+            parts = []
+            for t, off in zip(trees, offsets):
+                c = getattr(t, attr).astype(np.int64)
+                parts.append(np.where(c >= 0, c + off, -1))
+            return np.concatenate(parts)
+
+        def missing_left(t) -> np.ndarray:
+            # older sklearn trees have no missing-value support: NaN <= threshold is False, so right
+            m = getattr(t, "missing_go_to_left", None)
+            return np.zeros(t.node_count, dtype=np.bool_) if m is None else np.asarray(m).astype(np.bool_)
+
+        probas = []
+        for t in trees:
+            # Same normalization as DecisionTreeClassifier.predict_proba, done once per leaf.
+            proba = t.value[:, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            probas.append(proba / normalizer)
+
+        meta = dict(meta or {})
+        meta.update({"n_estimators": len(trees), "n_features_in": int(forest.n_features_in_)})
+        return cls(
+            children("children_left"),
+            children("children_right"),
+            np.concatenate([t.feature for t in trees]).astype(np.int64),
+            np.concatenate([t.threshold for t in trees]).astype(np.float64),
+            np.concatenate([missing_left(t) for t in trees]),
+            np.concatenate(probas),
+            offsets,
+            np.asarray(forest.classes_),
+            meta,
+        )
+
+    def save(self, out_dir: Path):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        np.save(out_dir / LEFT_FILE, np.ascontiguousarray(self.left))
+        np.save(out_dir / RIGHT_FILE, np.ascontiguousarray(self.right))
+        np.save(out_dir / FEATURE_FILE, np.ascontiguousarray(self.feature))
+        np.save(out_dir / THRESHOLD_FILE, np.ascontiguousarray(self.threshold))
+        np.save(out_dir / MISSING_FILE, np.ascontiguousarray(self.missing_go_to_left))
+        np.save(out_dir / PROBA_FILE, np.ascontiguousarray(self.leaf_proba))
+        np.save(out_dir / ROOTS_FILE, np.ascontiguousarray(self.roots))
+        np.save(out_dir / CLASSES_FILE, np.asarray(self.classes_))
+        (out_dir / META_FILE).write_text(json.dumps(self.meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, table_dir: Path, mmap_mode: Optional[str] = "r") -> "FlatForest":
+        def arr(name: str) -> np.ndarray:
+            return np.load(table_dir / name, mmap_mode=mmap_mode)
+
+        return cls(
+            arr(LEFT_FILE), arr(RIGHT_FILE), arr(FEATURE_FILE), arr(THRESHOLD_FILE), arr(MISSING_FILE), arr(PROBA_FILE),
+            np.load(table_dir / ROOTS_FILE), np.load(table_dir / CLASSES_FILE, allow_pickle=False),
+            json.loads((table_dir / META_FILE).read_text(encoding="utf-8")),
+        )
+
+    @staticmethod
+    def exists(table_dir: Path) -> bool:
+        return all((table_dir / f).exists() for f in (
+            LEFT_FILE, RIGHT_FILE, FEATURE_FILE, THRESHOLD_FILE, MISSING_FILE, PROBA_FILE, ROOTS_FILE, CLASSES_FILE,
+            META_FILE,
+        ))
+
+    def apply(self, X) -> np.ndarray:
+        # Leaf index of every (row, tree) pair; all trees descend together, one level per step.
+        X = np.asarray(X, dtype=np.float32).reshape(-1, self.n_features_in_)
+        n_trees = len(self.roots)
+        node = np.tile(np.asarray(self.roots, dtype=np.int64), len(X))
+        rows = np.repeat(np.arange(len(X)), n_trees)
+        active = np.flatnonzero(self.left[node] >= 0)
+        while len(active):
+            at = node[active]
+            x = X[rows[active], self.feature[at]]
+            go_left = np.where(np.isnan(x), self.missing_go_to_left[at], x <= self.threshold[at])
+            node[active] = np.where(go_left, self.left[at], self.right[at])
+            active = active[self.left[node[active]] >= 0]
+        return node.reshape(len(X), n_trees)
+
+    def predict_proba(self, X) -> np.ndarray:
+        # sklearn compares float32 inputs against float64 thresholds and adds the per-tree
+        # probabilities one tree at a time; cumsum follows that order, so the result agrees with
+        # RandomForestClassifier.predict_proba up to rounding (~1e-16).
+        leaf = self.apply(X)
+        if not leaf.shape[1]:
+            return np.zeros((len(leaf), self.n_classes_), dtype=np.float64)
+        proba = np.cumsum(self.leaf_proba[leaf], axis=1)[:, -1]
+        proba /= leaf.shape[1]
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
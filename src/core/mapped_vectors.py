@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+import numpy as np
+from spacy.vectors import Vectors
+
+DATA_FILE = "data.npy"
+KEYS_FILE = "keys.npy"
+ROWS_FILE = "rows.npy"
+META_FILE = "meta.json"
+
+def export_vectors(nlp, out_dir: Path) -> int:
+    vectors = nlp.vocab.vectors
+    if vectors.mode != "default":
+        raise ValueError(f"Only default-mode vectors can be memory-mapped, got '{vectors.mode}'")
+
+    items = list(vectors.key2row.items())
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / DATA_FILE, np.ascontiguousarray(vectors.data, dtype=np.float32))
+    np.save(out_dir / KEYS_FILE, np.array([k for k, _ in items], dtype=np.uint64))
+    np.save(out_dir / ROWS_FILE, np.array([r for _, r in items], dtype=np.int64))
+    meta = {"name": vectors.name, "model": f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', '')}-{nlp.meta.get('version', '')}"}
+    (out_dir / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+    return len(items)
+
+def vectors_exported(table_dir: Path) -> bool:
+    return all((table_dir / f).exists() for f in (DATA_FILE, KEYS_FILE, ROWS_FILE, META_FILE))
+
+def attach_vectors(nlp, table_dir: Path):
+    # The vector table stays a read-only memmap, so every process on the host shares its pages.
+    meta = json.loads((table_dir / META_FILE).read_text(encoding="utf-8"))
+    vectors = Vectors(strings=nlp.vocab.strings, data=np.load(table_dir / DATA_FILE, mmap_mode="r"), name=meta.get("name"))
+    keys = np.load(table_dir / KEYS_FILE)
+    rows = np.load(table_dir / ROWS_FILE)
+    vectors.key2row = dict(zip(keys.tolist(), rows.tolist()))
+    nlp.vocab.vectors = vectors
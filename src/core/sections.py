@@ -0,0 +1,37 @@
+import re
+import textwrap
+from typing import Iterator, List
+
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+def split_paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in PARAGRAPH_RE.split(text) if p.strip()]
+
+def _pieces(text: str, max_chars: int) -> Iterator[str]:
+    for paragraph in split_paragraphs(text):
+        if len(paragraph) <= max_chars:
+            yield paragraph
+            continue
+        for sentence in SENTENCE_RE.split(paragraph):
+            if len(sentence) <= max_chars:
+                yield sentence
+            else:
+                yield from textwrap.wrap(sentence, max_chars, break_on_hyphens=False)
+
+def split_sections(text: str, max_chars: int) -> List[str]:
+    # Packs whole paragraphs (or, for oversized ones, sentences) into sections of at most
+    # max_chars; every cut falls on whitespace, so normalizing and joining the sections with
+    # a space gives normalize_text(text).
+    sections: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in _pieces(text, max(1, max_chars)):
+        if current and size + 2 + len(piece) > max_chars:
+            sections.append("\n\n".join(current))
+            current, size = [], 0
+        size += len(piece) + (2 if current else 0)
+        current.append(piece)
+    if current:
+        sections.append("\n\n".join(current))
+    return sections
@@ -1,15 +1,96 @@
 import spacy
 from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Set, Tuple
+from spacy.util import get_model_meta, get_package_path, load_config
 
-@lru_cache(maxsize=1)
-def load_spacy_nlp(model_name: str = "en_core_web_md"):
+ALL_REQUIREMENTS = frozenset({"tag", "pos", "morph", "lemma", "dep", "sents", "vectors"})
 
+# components of the en_core_web_* pipelines that produce each token annotation
+REQUIREMENT_COMPONENTS: Dict[str, Tuple[str, ...]] = {
+    "tag": ("tok2vec", "tagger"),
+    "pos": ("tok2vec", "tagger", "morphologizer", "attribute_ruler"),
+    "morph": ("tok2vec", "tagger", "morphologizer", "attribute_ruler"),
+    "lemma": ("tok2vec", "tagger", "morphologizer", "attribute_ruler", "lemmatizer"),
+    "dep": ("tok2vec", "parser"),
+    "sents": ("tok2vec", "parser"),
+}
+
+KNOWN_COMPONENTS = ("tok2vec", "tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer", "ner")
+
+class ModelInfo(NamedTuple):
+    components: Tuple[str, ...]
+    # components whose model embeds the vocab vectors (tok2vec with include_static_vectors);
+    # they fail with E896 when the vectors are excluded
+    static_vectors: FrozenSet[str]
+
+def _static_vectors(section) -> bool:
+    if isinstance(section, dict):
+        if section.get("include_static_vectors") is True:
+            return True
+        if any("StaticVectors" in str(section.get(k, "")) for k in ("@architectures", "@layers")):
+            return True
+        return any(_static_vectors(v) for v in section.values())
+    return False
+
+def static_vector_components(config, names: Iterable[str]) -> FrozenSet[str]:
+    components = config.get("components", {})
+    return frozenset(name for name in names if _static_vectors(components.get(name)))
+
+def uses_static_vectors(nlp) -> bool:
+    return bool(static_vector_components(nlp.config, nlp.pipe_names))
+
+def _model_info(model_name: str) -> Optional[ModelInfo]:
     try:
-        nlp = spacy.load(model_name, disable=["ner"])
-        return nlp
-    except OSError:
+        path = Path(model_name) if Path(model_name).exists() else get_package_path(model_name)
+        meta = get_model_meta(path)
+    except (ImportError, OSError, ValueError):
+        return None
+    components = tuple(meta.get("components") or meta.get("pipeline") or ())
+    # installed packages keep the pipeline in a versioned subdirectory next to their meta.json
+    config_path = path / "config.cfg"
+    if not config_path.exists():
+        config_path = path / f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}" / "config.cfg"
+    try:
+        config = load_config(config_path, interpolate=False)
+    except (OSError, ValueError):
+        # unknown layout: assume the vectors are needed rather than break every parse
+        return ModelInfo(components, frozenset(components))
+    return ModelInfo(components, static_vector_components(config, components))
+
+def pipeline_components(requires: Iterable[str], available: Iterable[str]) -> Set[str]:
+    requires = set(requires)
+    available = set(available)
+    # sentence boundaries alone come from the much cheaper senter when the model ships one
+    sents = ("senter",) if "dep" not in requires and "senter" in available else REQUIREMENT_COMPONENTS["sents"]
+    keep = set()
+    for r in requires:
+        keep.update(sents if r == "sents" else REQUIREMENT_COMPONENTS.get(r, ()))
+    return keep
+
+@lru_cache(maxsize=None)
+def _load_pipeline(model_name: str, requires: FrozenSet[str], load_vectors: Optional[bool]):
+    info = _model_info(model_name)
+    if info is None:
         print(f"The model'{model_name}' is not found. Installing...")
         from spacy.cli import download
         download(model_name)
-        nlp = spacy.load(model_name, disable=["ner"])
-        return nlp
\ No newline at end of file
+        info = _model_info(model_name) or ModelInfo((), frozenset())
+
+    keep = pipeline_components(requires, info.components)
+    exclude = sorted((set(info.components) | set(KNOWN_COMPONENTS)) - keep)
+    if load_vectors is None:
+        load_vectors = "vectors" in requires or bool(info.static_vectors & keep)
+    if not load_vectors:
+        exclude.append("vectors")
+    nlp = spacy.load(model_name, exclude=exclude)
+    for name in list(nlp.disabled):
+        nlp.enable_pipe(name)
+    return nlp
+
+def load_spacy_nlp(model_name: str = "en_core_web_md", requires: Optional[Iterable[str]] = None,
+                   load_vectors: Optional[bool] = None):
+    # load_vectors=False leaves the vector table out even when a component needs it, for callers
+    # that attach it themselves; None loads it when requires or the kept components need it
+    requires = ALL_REQUIREMENTS if requires is None else frozenset(requires)
+    return _load_pipeline(model_name, requires, load_vectors)
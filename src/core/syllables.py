@@ -0,0 +1,13 @@
+from functools import lru_cache
+
+try:
+    import textstat
+    textstat.set_lang("en")
+except Exception:
+    textstat = None
+
+@lru_cache(maxsize=200_000)
+def syllable_count(word: str) -> int:
+    if textstat is None:
+        return 0
+    return int(textstat.syllable_count(word))
@@ -0,0 +1,101 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# seconds; the upper bounds of the Prometheus histogram buckets (+Inf is implicit)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    # Thread-safe labelled histogram with fixed buckets, rendered in the Prometheus text format.
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels -> (per-bucket counts incl. +Inf, sum)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][i] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = {labels: (list(counts), total[0]) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            base = ",".join(f'{k}="{v}"' for k, v in zip(self.label_names, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f'{self.name}_bucket{{{base}{sep}le="{le}"}} {cumulative}'
+            yield f"{self.name}_sum{{{base}}} {total}"
+            yield f"{self.name}_count{{{base}}} {cumulative}"
+
+stage_seconds = Histogram(
+    "text_complexity_stage_seconds", "Time spent per request in each analysis stage.", ("stage",),
+)
+
+# stage -> seconds of the request being handled; None outside a request (scripts, background threads)
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_stages", default=None)
+
+@contextmanager
+def request_stages() -> Iterator[Dict[str, float]]:
+    # Collects the timed() stages of one request; the dict is shared, not copied, by the tasks
+    # and threadpool calls that inherit the context.
+    stages: Dict[str, float] = {}
+    token = _request_stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _request_stages.reset(token)
+
+def finish_request(stages: Dict[str, float]):
+    # one observation per stage and request, however many timed() blocks fed it
+    for stage, seconds in stages.items():
+        stage_seconds.observe((stage,), seconds)
+
+def record(stage: str, seconds: float):
+    stages = _request_stages.get()
+    if stages is None:
+        stage_seconds.observe((stage,), seconds)
+    else:
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+def record_all(stages: Dict[str, float]):
+    for stage, seconds in stages.items():
+        record(stage, seconds)
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+def server_timing(stages: Dict[str, float], total: Optional[float] = None) -> str:
+    parts = [f"{stage};dur={seconds * 1000.0:.2f}" for stage, seconds in stages.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000.0:.2f}")
+    return ", ".join(parts)
+
+def call_timed(fn, *args) -> Tuple[object, Dict[str, float], float]:
+    # fn(*args) with its own stages, e.g. in a pool worker: returns (result, stages, seconds)
+    start = time.perf_counter()
+    with request_stages() as stages:
+        result = fn(*args)
+    return result, stages, time.perf_counter() - start
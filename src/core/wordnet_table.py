@@ -0,0 +1,145 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from spacy.strings import get_string_id
+from src.config.feature_config import WORDNET_TABLE_DIR
+
+KEYS_FILE = "keys.npy"
+COUNTS_FILE = "synset_counts.npy"
+DEPTHS_FILE = "hypernym_depths.npy"
+MORPHY_FILE = "morphy.json"
+
+WN_POS = ("n", "v", "a", "r")
+
+def _entry_key(form: str, pos: str) -> int:
+    return get_string_id(f"{form}\t{pos}")
+
+class WordNetTable:
+    def __init__(self, keys: np.ndarray, counts: np.ndarray, depths: np.ndarray,
+                 exceptions: Dict[str, Dict[str, List[str]]], substitutions: Dict[str, List[List[str]]]):
+        self.keys = keys
+        self.counts = counts
+        self.depths = depths
+        self.exceptions = exceptions
+        self.substitutions = substitutions
+
+    @classmethod
+    def load(cls, table_dir: Path) -> "WordNetTable":
+        morphy = json.loads((table_dir / MORPHY_FILE).read_text(encoding="utf-8"))
+        return cls(
+            np.load(table_dir / KEYS_FILE, mmap_mode="r"),
+            np.load(table_dir / COUNTS_FILE, mmap_mode="r"),
+            np.load(table_dir / DEPTHS_FILE, mmap_mode="r"),
+            morphy["exceptions"],
+            morphy["substitutions"],
+        )
+
+    def _entry(self, form: str, pos: str) -> Optional[Tuple[int, int]]:
+        key = np.uint64(_entry_key(form, pos))
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return int(self.counts[i]), int(self.depths[i])
+        return None
+
+    # Same candidate forms as nltk's WordNetCorpusReader._morphy, resolved against the table.
+    def _morphy(self, form: str, pos: str) -> List[Tuple[int, int]]:
+        exceptions = self.exceptions.get(pos, {})
+        if form in exceptions:
+            forms = exceptions[form]
+        else:
+            forms = [form[: -len(old)] + new for old, new in self.substitutions.get(pos, []) if form.endswith(old)]
+
+        seen = set()
+        entries = []
+        for f in [form] + forms:
+            if f in seen:
+                continue
+            entry = self._entry(f, pos)
+            if entry is not None:
+                seen.add(f)
+                entries.append(entry)
+        return entries
+
+    def lookup(self, lemma: str, pos: str) -> Tuple[int, int]:
+        entries = self._morphy(lemma.lower(), pos)
+        if not entries:
+            return 0, 0
+        return sum(c for c, _ in entries), max(d for _, d in entries)
+
+def _synset_depths(wn) -> Dict[str, int]:
+    depths: Dict[str, int] = {}
+
+    def depth(s) -> int:
+        name = s.name()
+        if name not in depths:
+            stack = [(s, False)]
+            while stack:
+                node, expanded = stack.pop()
+                key = node.name()
+                if key in depths:
+                    continue
+                parents = node.hypernyms() + node.instance_hypernyms()
+                if expanded or not parents:
+                    depths[key] = 1 + max((depths[p.name()] for p in parents), default=0)
+                    continue
+                stack.append((node, True))
+                stack.extend((p, False) for p in parents if p.name() not in depths)
+        return depths[name]
+
+    for s in wn.all_synsets():
+        depth(s)
+    return depths
+
+def build_wordnet_table(out_dir: Path) -> int:
+    from nltk.corpus import wordnet as wn
+
+    synset_depth = _synset_depths(wn)
+    keys, counts, depths = [], [], []
+    for form, by_pos in wn._lemma_pos_offset_map.items():
+        for pos in WN_POS:
+            offsets = by_pos.get(pos)
+            if not offsets:
+                continue
+            synsets = [wn.synset_from_pos_and_offset(pos, off) for off in offsets]
+            keys.append(_entry_key(form, pos))
+            counts.append(len(offsets))
+            depths.append(max((synset_depth[s.name()] for s in synsets if s is not None), default=0))
+
+    keys_arr = np.array(keys, dtype=np.uint64)
+    order = np.argsort(keys_arr, kind="stable")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / KEYS_FILE, keys_arr[order])
+    np.save(out_dir / COUNTS_FILE, np.array(counts, dtype=np.uint16)[order])
+    np.save(out_dir / DEPTHS_FILE, np.array(depths, dtype=np.uint8)[order])
+
+    morphy = {
+        "exceptions": {pos: wn._exception_map[pos] for pos in WN_POS},
+        "substitutions": {pos: [list(s) for s in wn.MORPHOLOGICAL_SUBSTITUTIONS[pos]] for pos in WN_POS},
+    }
+    (out_dir / MORPHY_FILE).write_text(json.dumps(morphy), encoding="utf-8")
+    return len(keys)
+
+def verify_wordnet_table(table: WordNetTable, forms_per_pos: int = 2000) -> int:
+    from nltk.corpus import wordnet as wn
+
+    mismatches = 0
+    for pos in WN_POS:
+        names = sorted(wn.all_lemma_names(pos))
+        names = names[::max(1, len(names) // forms_per_pos)]
+        probes = names + [n + "s" for n in names] + [n + "ed" for n in names] + list(wn._exception_map[pos])[:forms_per_pos]
+        for form in probes:
+            synsets = wn.synsets(form, pos=pos)
+            expected_depth = max((max(len(p) for p in s.hypernym_paths()) for s in synsets), default=0)
+            if table.lookup(form, pos) != (len(synsets), expected_depth):
+                mismatches += 1
+    return mismatches
+
+@lru_cache(maxsize=1)
+def load_wordnet_table(table_dir: Optional[str] = None) -> Optional[WordNetTable]:
+    path = Path(table_dir) if table_dir else WORDNET_TABLE_DIR
+    if not all((path / f).exists() for f in (KEYS_FILE, COUNTS_FILE, DEPTHS_FILE, MORPHY_FILE)):
+        return None
+    return WordNetTable.load(path)
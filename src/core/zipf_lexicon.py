@@ -0,0 +1,83 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+from spacy.strings import get_string_id
+from src.config.feature_config import ZIPF_TABLE_DIR
+
+KEYS_FILE = "keys.npy"
+VALUES_FILE = "centizipf.npy"
+
+class ZipfLexicon:
+    def __init__(self, keys: np.ndarray, values: np.ndarray):
+        self.keys = keys
+        self.values = values
+
+    @classmethod
+    def load(cls, table_dir: Path) -> "ZipfLexicon":
+        keys = np.load(table_dir / KEYS_FILE, mmap_mode="r")
+        values = np.load(table_dir / VALUES_FILE, mmap_mode="r")
+        return cls(keys, values)
+
+    def lookup(self, words: Iterable[str]) -> np.ndarray:
+        words = list(words)
+        if not len(self.keys):
+            return np.array([_fallback_zipf(w) for w in words], dtype=np.float64)
+        hashes = np.fromiter((get_string_id(w) for w in words), dtype=np.uint64, count=len(words))
+        pos = np.searchsorted(self.keys, hashes)
+        pos_in = np.minimum(pos, len(self.keys) - 1)
+        found = (pos < len(self.keys)) & (np.asarray(self.keys[pos_in]) == hashes)
+
+        out = np.empty(len(words), dtype=np.float64)
+        out[found] = np.asarray(self.values[pos_in[found]], dtype=np.float64) / 100
+        for i in np.flatnonzero(~found):
+            out[i] = _fallback_zipf(words[i])
+        return out
+
+def build_zipf_table(out_dir: Path, wordlist: str = "best") -> int:
+    from wordfreq import iter_wordlist, zipf_frequency
+
+    words = list(iter_wordlist("en", wordlist))
+    hashes = np.array([get_string_id(w) for w in words], dtype=np.uint64)
+    values = np.array([round(zipf_frequency(w, "en", wordlist) * 100) for w in words], dtype=np.uint16)
+
+    order = np.argsort(hashes, kind="stable")
+    hashes, values = hashes[order], values[order]
+    unique = np.ones(len(hashes), dtype=bool)
+    unique[1:] = hashes[1:] != hashes[:-1]
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / KEYS_FILE, hashes[unique])
+    np.save(out_dir / VALUES_FILE, values[unique])
+    return int(unique.sum())
+
+@lru_cache(maxsize=1)
+def load_zipf_lexicon(table_dir: Optional[str] = None) -> Optional[ZipfLexicon]:
+    path = Path(table_dir) if table_dir else ZIPF_TABLE_DIR
+    if not (path / KEYS_FILE).exists() or not (path / VALUES_FILE).exists():
+        return None
+    return ZipfLexicon.load(path)
+
+@lru_cache(maxsize=1)
+def _wordfreq():
+    try:
+        from wordfreq import zipf_frequency
+    except Exception:
+        return None
+    return zipf_frequency
+
+@lru_cache(maxsize=100_000)
+def _fallback_zipf(word: str) -> float:
+    zipf_frequency = _wordfreq()
+    if zipf_frequency is None:
+        return 0.0
+    return zipf_frequency(word, "en")
+
+def zipf_available() -> bool:
+    return load_zipf_lexicon() is not None or _wordfreq() is not None
+
+def zipf_frequencies(words: Iterable[str]) -> np.ndarray:
+    lexicon = load_zipf_lexicon()
+    if lexicon is not None:
+        return lexicon.lookup(words)
+    return np.array([_fallback_zipf(w) for w in words], dtype=np.float64)
@@ -1,7 +1,7 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from src.db.models import Metrics, Level
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 def get_level_by_id(db: Session, level_id: int) -> Optional[Level]:
     return db.get(Level, level_id)
@@ -27,4 +27,14 @@ def insert_metrics(db: Session, metrics: Dict[str, float], level_id: Optional[in
     db.add(row)
     db.commit()
     db.refresh(row)
-    return row
\ No newline at end of file
+    return row
+
+def level_ids(db: Session) -> Dict[str, int]:
+    return {lvl.name: lvl.id for lvl in db.execute(select(Level)).scalars().all()}
+
+def insert_metrics_bulk(db: Session, rows: List[Dict[str, float]]) -> int:
+    if not rows:
+        return 0
+    db.execute(insert(Metrics), rows)
+    db.commit()
+    return len(rows)
@@ -3,6 +3,10 @@ from src.db.database import engine
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced later explicitly
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, Float, String, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -70,8 +70,19 @@ class AnalysisLog(Base):
     __tablename__ = "analysis_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     level_id = Column(Integer, nullable=False)
     level_label=Column(String(4), nullable=False)
     text_length = Column(Integer, nullable=False)
-    source_type = Column(String, nullable=False)
\ No newline at end of file
+    source_type = Column(String, nullable=False)
+
+class AnalysisRollup(Base):
+    __tablename__ = "analysis_rollups"
+    __table_args__ = (UniqueConstraint("bucket_start", "level_id", "source_type", name="uq_analysis_rollups_bucket"),)
+
+    id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    level_id = Column(Integer, nullable=False)
+    source_type = Column(String, nullable=False)
+    log_count = Column(Integer, nullable=False, default=0)
+    text_length_sum = Column(BigInteger, nullable=False, default=0)
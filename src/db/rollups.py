@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from src.db.models import AnalysisLog, AnalysisRollup
+
+RollupKey = Tuple[datetime, int, str]
+
+def bucket_start(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+def aggregate_logs(rows: Iterable[Dict]) -> Dict[RollupKey, List[int]]:
+    totals: Dict[RollupKey, List[int]] = {}
+    for row in rows:
+        key = (bucket_start(row["created_at"]), int(row["level_id"]), row["source_type"])
+        acc = totals.setdefault(key, [0, 0])
+        acc[0] += 1
+        acc[1] += int(row["text_length"])
+    return totals
+
+def _rollup_values(totals: Dict[RollupKey, List[int]]) -> List[Dict]:
+    return [
+        {"bucket_start": b, "level_id": lvl, "source_type": src, "log_count": c, "text_length_sum": s}
+        for (b, lvl, src), (c, s) in totals.items()
+    ]
+
+def _upsert_statement(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(AnalysisRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=["bucket_start", "level_id", "source_type"],
+        set_={
+            "log_count": AnalysisRollup.log_count + stmt.excluded.log_count,
+            "text_length_sum": AnalysisRollup.text_length_sum + stmt.excluded.text_length_sum,
+        },
+    )
+
+def apply_rollups(db: Session, rows: List[Dict]):
+    # Adds a batch of AnalysisLog rows to the hourly counters inside the caller's transaction.
+    totals = aggregate_logs(rows)
+    if not totals:
+        return
+
+    values = _rollup_values(totals)
+    stmt = _upsert_statement(db.get_bind().dialect.name)
+    if stmt is not None:
+        db.execute(stmt, values)
+        return
+
+    for v in values:
+        row = db.execute(
+            select(AnalysisRollup).where(
+                AnalysisRollup.bucket_start == v["bucket_start"],
+                AnalysisRollup.level_id == v["level_id"],
+                AnalysisRollup.source_type == v["source_type"],
+            ).with_for_update()
+        ).scalar_one_or_none()
+        if row is None:
+            db.add(AnalysisRollup(**v))
+        else:
+            row.log_count += v["log_count"]
+            row.text_length_sum += v["text_length_sum"]
+    db.flush()
+
+def rebuild_rollups(db: Session, chunk_size: int = 10000) -> int:
+    # One full pass over analysis_logs, for databases that have logs older than the rollup table.
+    db.query(AnalysisRollup).delete()
+    rows = db.execute(
+        select(AnalysisLog.created_at, AnalysisLog.level_id, AnalysisLog.source_type, AnalysisLog.text_length)
+        .execution_options(yield_per=chunk_size)
+    ).mappings()
+    totals = aggregate_logs(rows)
+    values = _rollup_values(totals)
+    for i in range(0, len(values), chunk_size):
+        db.execute(insert(AnalysisRollup), values[i:i + chunk_size])
+    db.commit()
+    return len(values)
@@ -0,0 +1,183 @@
+import math
+from typing import Dict, Iterable, Optional
+import numpy as np
+from spacy.attrs import IS_ALPHA, POS
+from spacy.tokens import Doc
+
+from src.features import columnar, semantics
+from src.features.readability import readability_counts, readability_metrics
+from src.features.shared import release, sentences
+from src.config.feature_config import FEATURE_GROUPS
+
+GROUP_COUNTS = {
+    "lexical": (columnar.lexical_counts, columnar.lexical_metrics),
+    "syntax": (columnar.syntax_counts, columnar.syntax_metrics),
+    "morph": (columnar.morph_counts, columnar.morph_metrics),
+    "semantics": (columnar.semantics_counts, columnar.semantics_metrics),
+}
+
+class SimilarityStats:
+    # Cosine similarities of adjacent sentence vectors as (n, mean, M2, min) plus the first and
+    # last sentence vector, so two consecutive sections merge with the similarity across the seam.
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.first: Optional[np.ndarray] = None
+        self.last: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_doc(cls, doc: Doc) -> "SimilarityStats":
+        stats = cls()
+        sents = sentences(doc)
+        if not sents:
+            return stats
+        token_vecs, _ = semantics._token_vectors(doc)
+        vecs = semantics._sent_vectors(doc, sents, token_vecs)
+        stats.first, stats.last = vecs[0], vecs[-1]
+        if len(vecs) > 1:
+            stats._add(semantics._cosine_rows(vecs[:-1], vecs[1:]))
+        return stats
+
+    def _add(self, sims: np.ndarray):
+        if not len(sims):
+            return
+        other = SimilarityStats()
+        other.n = len(sims)
+        other.mean = float(sims.mean())
+        other.m2 = float(((sims - other.mean) ** 2).sum())
+        other.min = float(sims.min())
+        self._combine(other)
+
+    def _combine(self, other: "SimilarityStats"):
+        # Chan et al. parallel update of the mean and the sum of squared deviations
+        if not other.n:
+            return
+        if not self.n:
+            self.n, self.mean, self.m2, self.min = other.n, other.mean, other.m2, other.min
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.mean += delta * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+
+    def merge(self, other: "SimilarityStats") -> "SimilarityStats":
+        if other.first is None:
+            return self
+        if self.last is not None:
+            self._add(semantics._cosine_rows(self.last[None, :], other.first[None, :]))
+        self._combine(other)
+        if self.first is None:
+            self.first = other.first
+        self.last = other.last
+        return self
+
+    def metrics(self) -> Dict[str, float]:
+        if not self.n:
+            return {"sem_avg_sent_sim": 0.0, "sem_min_sent_sim": 0.0, "sem_std_sent_sim": 0.0}
+        return {
+            "sem_avg_sent_sim": self.mean,
+            "sem_min_sent_sim": self.min,
+            "sem_std_sent_sim": math.sqrt(self.m2 / self.n) if self.n > 1 else 0.0,
+        }
+
+class DispersionStats:
+    # Mean cosine distance of content-word vectors to their centroid c: since
+    # sum(cos(v, c)) = c . sum(v / |v|) / |c|, the vector sum and the unit-vector sum suffice.
+    def __init__(self):
+        self.n = 0
+        self.vec_sum: Optional[np.ndarray] = None
+        self.unit_sum: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_doc(cls, doc: Doc) -> "DispersionStats":
+        stats = cls()
+        token_vecs, has_vector = semantics._token_vectors(doc)
+        attrs = doc.to_array([IS_ALPHA, POS])
+        content = attrs[:, 0].astype(bool) & np.isin(attrs[:, 1], semantics.CONTENT_POS_IDS)
+        mat = token_vecs[content & has_vector].astype(np.float64)
+        if not len(mat):
+            return stats
+        norms = np.linalg.norm(mat, axis=1)
+        units = np.zeros_like(mat)
+        np.divide(mat, norms[:, None], out=units, where=norms[:, None] != 0.0)
+        stats.n = len(mat)
+        stats.vec_sum = mat.sum(axis=0)
+        stats.unit_sum = units.sum(axis=0)
+        return stats
+
+    def merge(self, other: "DispersionStats") -> "DispersionStats":
+        if not other.n:
+            return self
+        if not self.n:
+            self.n, self.vec_sum, self.unit_sum = other.n, other.vec_sum.copy(), other.unit_sum.copy()
+            return self
+        self.n += other.n
+        self.vec_sum += other.vec_sum
+        self.unit_sum += other.unit_sum
+        return self
+
+    def metric(self) -> float:
+        if self.n < 2:
+            return 0.0
+        centroid = self.vec_sum / self.n
+        norm = np.linalg.norm(centroid)
+        if norm == 0.0:
+            return 1.0
+        return float(1.0 - np.dot(centroid, self.unit_sum) / (norm * self.n))
+
+class FeatureAccumulator:
+    # Mergeable sufficient statistics of the feature groups over consecutive sections of one text.
+    # Each section Doc is reduced to counts right away, so no more than one Doc is held at a time.
+    # Readability uses the "doc" engine counts; callers on the textstat engine score the text itself.
+    def __init__(self, groups: Iterable[str] = FEATURE_GROUPS):
+        self.groups = tuple(groups)
+        self.counts: Dict[str, Dict[str, object]] = {}
+        self.similarity = SimilarityStats()
+        self.dispersion = DispersionStats()
+        self.sections = 0
+
+    @classmethod
+    def from_doc(cls, doc: Doc, groups: Iterable[str] = FEATURE_GROUPS) -> "FeatureAccumulator":
+        acc = cls(groups)
+        try:
+            c = columnar.DocColumns(doc)
+            for group in acc.groups:
+                if group in GROUP_COUNTS:
+                    acc.counts[group] = GROUP_COUNTS[group][0](c)
+            if "readability" in acc.groups:
+                acc.counts["readability"] = readability_counts(doc)
+            if "semantics" in acc.groups:
+                acc.similarity = SimilarityStats.from_doc(doc)
+                acc.dispersion = DispersionStats.from_doc(doc)
+        finally:
+            release(doc)
+        acc.sections = 1
+        return acc
+
+    def merge(self, other: "FeatureAccumulator") -> "FeatureAccumulator":
+        # other must be the section that follows self in the text
+        for group, counts in other.counts.items():
+            columnar.merge_counts(self.counts.setdefault(group, {}), counts)
+        self.similarity.merge(other.similarity)
+        self.dispersion.merge(other.dispersion)
+        self.sections += other.sections
+        return self
+
+    def metrics(self) -> Dict[str, float]:
+        metrics: Dict[str, float] = {}
+        for group in self.groups:
+            counts = self.counts.get(group)
+            if counts is None:
+                continue
+            if group == "readability":
+                metrics.update(readability_metrics(counts))
+                continue
+            metrics.update(GROUP_COUNTS[group][1](counts))
+            if group == "semantics":
+                metrics.update(self.similarity.metrics())
+                metrics["sem_word_vector_dispersion"] = self.dispersion.metric()
+        return {k: round(float(v), 3) for k, v in metrics.items()}
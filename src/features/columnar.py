@@ -0,0 +1,339 @@
+from typing import Callable, Dict, Iterable
+from fractions import Fraction
+import numpy as np
+from spacy.tokens import Doc
+from spacy.attrs import (
+    POS, TAG, DEP, HEAD, IS_ALPHA, IS_STOP, IS_SPACE, LEMMA, SENT_START,
+    LENGTH, ORTH, MORPH,
+)
+from spacy.parts_of_speech import IDS as POS_IDS
+from spacy.strings import get_string_id
+
+from src.core.zipf_lexicon import zipf_frequencies, zipf_available
+from src.core.syllables import syllable_count
+from src.core.dep_tree import DepTree
+from src.features import lexical, morph, semantics
+from src.features.syntax import SUB_CONJS
+from src.features.readability import readability_from_doc
+from src.config.feature_config import FEATURE_GROUPS
+
+COLUMNS = [POS, TAG, DEP, HEAD, IS_ALPHA, IS_STOP, IS_SPACE, LEMMA, SENT_START, LENGTH, ORTH, MORPH]
+
+def _pos(*names) -> np.ndarray:
+    return np.array([POS_IDS[n] for n in names], dtype=np.uint64)
+
+def _str(*names) -> np.ndarray:
+    return np.array([get_string_id(n) for n in names], dtype=np.uint64)
+
+class DocColumns:
+    def __init__(self, doc: Doc):
+        self.doc = doc
+        self.strings = doc.vocab.strings
+        arr = doc.to_array(COLUMNS)
+        (self.pos, self.tag, self.dep, head, alpha, stop, space,
+         self.lemma, sent_start, self.length, self.orth, self.morph) = arr.T
+
+        self.n = len(doc)
+        self.idx = np.arange(self.n, dtype=np.int64)
+        self.heads = self.idx + head.astype(np.int64)
+        self.alpha = alpha.astype(bool)
+        self.stop = stop.astype(bool)
+        self.space = space.astype(bool)
+
+        starts = sent_start.astype(np.int64) == 1
+        if self.n:
+            starts[0] = True
+        self.sent_id = np.cumsum(starts) - 1
+        self.n_sents = int(starts.sum())
+
+        self.tree = DepTree(self.heads, self.sent_id)
+
+    def key_lower(self, fallback_to_text: bool) -> np.ndarray:
+        if not fallback_to_text:
+            return self.lemma
+        return np.where(self.lemma == 0, self.orth, self.lemma)
+
+    def lookup(self, keys: np.ndarray, fn: Callable[[int], object], dtype=float) -> np.ndarray:
+        uniq, inv = np.unique(keys, return_inverse=True)
+        vals = np.array([fn(int(k)) for k in uniq], dtype=dtype)
+        return vals[inv.reshape(-1)] if len(uniq) else np.zeros(0, dtype=dtype)
+
+    def morph_flag(self, feature: str, value: str) -> np.ndarray:
+        uniq, first, inv = np.unique(self.morph, return_index=True, return_inverse=True)
+        flags = np.array([value in self.doc[int(i)].morph.get(feature, []) for i in first], dtype=bool)
+        return flags[inv.reshape(-1)] if len(uniq) else np.zeros(0, dtype=bool)
+
+    def ancestor_any(self, mask: np.ndarray) -> np.ndarray:
+        nonroot = self.heads != self.idx
+        found = nonroot & mask[self.heads]
+        anc = self.heads.copy()
+        while True:
+            nxt = anc[anc]
+            if np.array_equal(nxt, anc):
+                return found
+            found = found | found[anc]
+            anc = nxt
+
+    def child_any(self, mask: np.ndarray) -> np.ndarray:
+        out = np.zeros(self.n, dtype=bool)
+        hits = mask & (self.heads != self.idx)
+        out[self.heads[hits]] = True
+        return out
+
+def _share(count, total) -> float:
+    total = int(total)
+    return int(count) / total if total else 0.0
+
+def merge_counts(into: Dict[str, object], counts: Dict[str, object]) -> Dict[str, object]:
+    # Adds counts into `into` in place: counters add up, sets of distinct items are united.
+    for k, v in counts.items():
+        if isinstance(v, (set, frozenset)):
+            into.setdefault(k, set()).update(v)
+        else:
+            into[k] = into[k] + v if k in into else v
+    return into
+
+def lexical_counts(c: DocColumns) -> Dict[str, object]:
+    words = c.alpha
+    n_words = int(words.sum())
+    non_space = ~c.space
+    num_or_symbol = non_space & ((c.pos == POS_IDS["NUM"]) | (~c.alpha & ~c.space))
+
+    counts: Dict[str, object] = {
+        "words": n_words, "length": 0, "stop": 0, "oov": 0, "awl": 0, "syllables": 0,
+        "non_space": int(non_space.sum()), "num_symbol": int(num_or_symbol.sum()), "lemmas": set(),
+    }
+    if n_words:
+        lemmas = c.lemma[words]
+        uniq, inv = np.unique(lemmas, return_inverse=True)
+        inv = inv.reshape(-1)
+        counts["length"] = int(c.length[words].sum())
+        counts["lemmas"] = {c.strings[int(k)].lower() for k in uniq}
+        counts["stop"] = int(c.stop[words].sum())
+
+        if zipf_available():
+            zipf = zipf_frequencies([c.strings[int(k)].lower() for k in uniq])
+            counts["oov"] = int((zipf < 2.5)[inv].sum())
+
+        awl = lexical._load_awl()
+        if awl:
+            counts["awl"] = int(c.lookup(lemmas, lambda k: c.strings[k].lower() in awl, dtype=bool).sum())
+
+        if lexical.textstat is not None:
+            counts["syllables"] = int(c.lookup(c.orth[words], lambda k: syllable_count(c.strings[k]), dtype=np.int64).sum())
+    return counts
+
+def lexical_metrics(counts: Dict[str, object]) -> Dict[str, float]:
+    n_words = counts["words"]
+    metrics = {
+        "lex_avg_word_len": _share(counts["length"], n_words),
+        "lex_ttr_lemma": _share(len(counts["lemmas"]), n_words),
+        "lex_share_stop": _share(counts["stop"], n_words),
+        "lex_share_num_symbol": _share(counts["num_symbol"], counts["non_space"]),
+        "lex_share_oov": _share(counts["oov"], n_words),
+        "lex_share_awl": _share(counts["awl"], n_words),
+        "lex_avg_syll_per_word": _share(counts["syllables"], n_words),
+    }
+    return {k: round(v, 3) for k, v in metrics.items()}
+
+def _columnar_lexical(c: DocColumns) -> Dict[str, float]:
+    return lexical_metrics(lexical_counts(c))
+
+def _per_sentence(c: DocColumns, mask: np.ndarray) -> np.ndarray:
+    return np.bincount(c.sent_id[mask], minlength=c.n_sents)
+
+def syntax_counts(c: DocColumns) -> Dict[str, object]:
+    counts: Dict[str, object] = {
+        "sents": c.n_sents, "words": 0, "finite": 0, "complex": 0, "passive": 0,
+        "depth": 0, "rooted": 0, "sub_conjs": 0, "coord": 0,
+    }
+    if not c.n_sents:
+        return counts
+
+    verbish = np.isin(c.pos, _pos("VERB", "AUX"))
+    finite = verbish & c.morph_flag("VerbForm", "Fin")
+
+    has_nsubjpass = _per_sentence(c, c.dep == get_string_id("nsubjpass")) > 0
+    be_aux = _per_sentence(c, (c.lemma == get_string_id("be")) & (c.pos == POS_IDS["AUX"])) > 0
+    vbn_head = _per_sentence(c, (c.tag == get_string_id("VBN")) & (c.pos == POS_IDS["VERB"])) > 0
+    passive = has_nsubjpass | (be_aux & vbn_head)
+
+    sent_depth = c.tree.sentence_max_depth()
+    has_root = c.tree.sentence_has_root()
+
+    words = c.alpha
+    sub_conj_lemma = c.lookup(c.lemma[words], lambda k: c.strings[k].lower() in SUB_CONJS, dtype=bool)
+    sub_conjs = (c.pos[words] == POS_IDS["SCONJ"]) | sub_conj_lemma
+
+    counts.update({
+        "words": int(words.sum()),
+        "finite": int(finite.sum()),
+        "complex": int((_per_sentence(c, verbish) > 1).sum()),
+        "passive": int(passive.sum()),
+        "depth": int(sent_depth[has_root].sum()),
+        "rooted": int(has_root.sum()),
+        "sub_conjs": int(sub_conjs.sum()),
+        "coord": int(np.isin(c.dep, _str("cc", "conj")).sum()),
+    })
+    return counts
+
+def syntax_metrics(counts: Dict[str, object]) -> Dict[str, float]:
+    n_sents = counts["sents"]
+    metrics = {
+        "syn_avg_sentence_length": _share(counts["words"], n_sents),
+        "syn_avg_clause_per_sentence": _share(counts["finite"], n_sents),
+        "syn_share_complex_sentences": _share(counts["complex"], n_sents),
+        "syn_share_passive_sentences": _share(counts["passive"], n_sents),
+        "syn_avg_dependency_depth": _share(counts["depth"], counts["rooted"]),
+        "syn_share_sub_conjs": _share(counts["sub_conjs"], counts["words"]),
+        "syn_avg_coord_per_sentence": _share(counts["coord"], n_sents),
+    }
+    return {k: round(v, 3) for k, v in metrics.items()}
+
+def _columnar_syntax(c: DocColumns) -> Dict[str, float]:
+    return syntax_metrics(syntax_counts(c))
+
+MORPH_POS_SHARES = {
+    "morph_share_nouns": "NOUN",
+    "morph_share_verbs": "VERB",
+    "morph_share_adj": "ADJ",
+    "morph_share_adv": "ADV",
+    "morph_share_pronouns": "PRON",
+    "morph_share_propn": "PROPN",
+    "morph_share_aux": "AUX",
+}
+
+def morph_counts(c: DocColumns) -> Dict[str, object]:
+    words = c.alpha
+    n_words = int(words.sum())
+    word_pos = c.pos[words]
+
+    preds = np.isin(c.pos, _pos("VERB", "AUX"))
+
+    aux_like = np.isin(c.dep, _str("aux", "auxpass")) | (c.pos == POS_IDS["AUX"])
+    has_have_aux = aux_like & (c.lemma == get_string_id("have"))
+    has_be_aux = aux_like & (c.lemma == get_string_id("be"))
+    future_aux = aux_like & np.isin(c.lemma, _str("will", "shall", "wo")) & (c.tag == get_string_id("MD"))
+
+    def linked(mask):
+        return c.child_any(mask) | c.ancestor_any(mask)
+
+    verbs = c.pos == POS_IDS["VERB"]
+    has_have = linked(has_have_aux)
+    has_be = linked(has_be_aux)
+    vbn = c.tag == get_string_id("VBN")
+    vbg = c.tag == get_string_id("VBG")
+    perfect_prog = verbs & has_have & has_be & vbg
+    going_to = (c.lemma == get_string_id("go")) & vbg & has_be
+
+    morphemes = 0
+    if n_words:
+        keys = np.stack([c.lemma, np.where(c.lemma == 0, c.orth, 0), c.morph], axis=1)[words]
+        uniq, first, inv = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        word_idx = c.idx[words]
+        counts = np.array([morph._count_morphemes(c.doc[int(word_idx[i])]) for i in first], dtype=np.int64)
+        morphemes = int(counts[inv.reshape(-1)].sum())
+
+    out: Dict[str, object] = {name: int((word_pos == POS_IDS[pos]).sum()) for name, pos in MORPH_POS_SHARES.items()}
+    out.update({
+        "words": n_words,
+        "preds": int(preds.sum()),
+        "modals": int((preds & (c.tag == get_string_id("MD"))).sum()),
+        "past": int((preds & c.morph_flag("Tense", "Past")).sum()),
+        "present": int((preds & c.morph_flag("Tense", "Pres")).sum()),
+        "perfect": int((verbs & has_have & vbn & ~perfect_prog).sum()),
+        "progressive": int((verbs & has_be & vbg & ~has_have).sum()),
+        "perfect_progressive": int(perfect_prog.sum()),
+        "future": int((verbs & (linked(future_aux) | going_to)).sum()),
+        "content": int(np.isin(word_pos, _pos(*morph.CONTENT_POS)).sum()),
+        "function": int(np.isin(word_pos, _pos(*morph.FUNCTION_POS)).sum()),
+        "morphemes": morphemes,
+    })
+    return out
+
+def morph_metrics(counts: Dict[str, object]) -> Dict[str, float]:
+    n_words = counts["words"]
+    n_preds = counts["preds"]
+    metrics = {name: _share(counts[name], n_words) for name in MORPH_POS_SHARES}
+    metrics.update({
+        "morph_share_modals": _share(counts["modals"], n_preds),
+        "morph_tense_past_share": _share(counts["past"], n_preds),
+        "morph_tense_present_share": _share(counts["present"], n_preds),
+        "morph_share_perfect": _share(counts["perfect"], n_preds),
+        "morph_share_progressive": _share(counts["progressive"], n_preds),
+        "morph_share_perfect_progressive": _share(counts["perfect_progressive"], n_preds),
+        "morph_share_future": _share(counts["future"], n_preds),
+        "morph_content_function_ratio": 0.0,
+        "morph_avg_morphemes_per_word": _share(counts["morphemes"], n_words),
+    })
+    if n_words:
+        content, function = counts["content"], counts["function"]
+        metrics["morph_content_function_ratio"] = float(content) if function == 0 else content / function
+    return {k: round(v, 3) for k, v in metrics.items()}
+
+def _columnar_morph(c: DocColumns) -> Dict[str, float]:
+    return morph_metrics(morph_counts(c))
+
+def semantics_counts(c: DocColumns) -> Dict[str, object]:
+    # Word-level semantic statistics; sentence coherence and vector dispersion are not simple
+    # counts, see src/features/accumulators.py for their mergeable form.
+    words = c.alpha
+    n_words = int(words.sum())
+    counts: Dict[str, object] = {
+        "zipf_words": 0, "zipf_sum": Fraction(0), "rare": 0, "very_rare": 0,
+        "wn_content": 0, "polysemy": 0, "hypernym_depth": 0,
+    }
+    keys = c.key_lower(fallback_to_text=True)
+
+    if n_words and zipf_available():
+        uniq, n = np.unique(keys[words], return_counts=True)
+        vals = zipf_frequencies([c.strings[int(k)].lower() for k in uniq])
+        counts["zipf_words"] = n_words
+        counts["zipf_sum"] = sum((Fraction(float(v)) * int(m) for v, m in zip(vals, n)), Fraction(0))
+        counts["rare"] = int(n[vals < 4.0].sum())
+        counts["very_rare"] = int(n[vals < 3.0].sum())
+
+    content = words & np.isin(c.pos, _pos(*semantics.CONTENT_POS))
+    if content.any() and semantics.wordnet_available():
+        pairs = np.stack([keys[content], c.pos[content]], axis=1)
+        uniq, first, n = np.unique(pairs, axis=0, return_index=True, return_counts=True)
+        content_idx = c.idx[content]
+        polysemy = 0
+        depth = 0
+        for i, m in zip(first, n):
+            token = c.doc[int(content_idx[i])]
+            polysemy += semantics._lemma_synset_count(token) * int(m)
+            depth += semantics._max_hypernym_depth(token) * int(m)
+        counts.update({"wn_content": int(n.sum()), "polysemy": polysemy, "hypernym_depth": depth})
+    return counts
+
+def semantics_metrics(counts: Dict[str, object]) -> Dict[str, float]:
+    n_words = counts["zipf_words"]
+    return {
+        "sem_mean_zipf": float(counts["zipf_sum"] / n_words) if n_words else 0.0,
+        "sem_share_rare_zipf_lt_4": _share(counts["rare"], n_words),
+        "sem_share_very_rare_zipf_lt_3": _share(counts["very_rare"], n_words),
+        "sem_avg_polysemy": _share(counts["polysemy"], counts["wn_content"]),
+        "sem_avg_hypernym_depth": _share(counts["hypernym_depth"], counts["wn_content"]),
+    }
+
+def _columnar_semantics(c: DocColumns) -> Dict[str, float]:
+    res: Dict[str, float] = semantics_metrics(semantics_counts(c))
+    res.update(semantics.sem_sentence_coherence(c.doc))
+    res["sem_word_vector_dispersion"] = semantics.sem_word_vector_dispersion(c.doc)
+    return {k: round(float(v), 3) for k, v in res.items()}
+
+def extract_columnar(doc: Doc, norm_text: str, groups: Iterable[str] = FEATURE_GROUPS) -> Dict[str, float]:
+    c = DocColumns(doc)
+    metrics: Dict[str, float] = {}
+    if "lexical" in groups:
+        metrics.update(_columnar_lexical(c))
+    if "syntax" in groups:
+        metrics.update(_columnar_syntax(c))
+    if "morph" in groups:
+        metrics.update(_columnar_morph(c))
+    if "semantics" in groups:
+        metrics.update(_columnar_semantics(c))
+    if "readability" in groups:
+        metrics.update(readability_from_doc(doc, norm_text))
+    return metrics
@@ -7,13 +7,12 @@ try:
 except Exception:
     textstat = None
 
-try:
-    from wordfreq import zipf_frequency
-except Exception:
-    zipf_frequency = None
+from src.core.zipf_lexicon import zipf_frequencies, zipf_available
+from src.core.syllables import syllable_count
+from src.features.shared import alpha_tokens
 
-def _alpha_tokens(doc):
-    return [t for t in doc if t.is_alpha]
+# token annotations read by this group, see src/features/requirements.py
+REQUIRES = ("pos", "lemma")
 
 @lru_cache(maxsize=1)
 def _awl_path(default: Optional[str] = None) -> Path:
@@ -32,19 +31,19 @@ def _load_awl(path: Optional[str] = None) -> Set[str]:
         return {line.strip().lower() for line in f if line.strip()}
 
 def avg_word_len(doc) -> float:
-    words = _alpha_tokens(doc)
+    words = alpha_tokens(doc)
     if not words:
         return 0.0
     return sum(len(t.text) for t in words) / len(words)
 
 def type_token_ratio_lemma(doc) -> float:
-    lemmas = [t.lemma_.lower() for t in _alpha_tokens(doc)]
+    lemmas = [t.lemma_.lower() for t in alpha_tokens(doc)]
     if not lemmas:
         return 0.0
     return len(set(lemmas)) / len(lemmas)
 
 def share_stopwords(doc) -> float:
-    words = _alpha_tokens(doc)
+    words = alpha_tokens(doc)
     if not words:
         return 0.0
     stop_count = sum(1 for t in words if t.is_stop)
@@ -58,14 +57,16 @@ def share_num_symbol(doc) -> float:
     return num_or_symbol / len(tokens)
 
 def share_oov(doc) -> float:
-    words = _alpha_tokens(doc)
-    if not words:
+    words = alpha_tokens(doc)
+    if not words or not zipf_available():
         return 0.0
-    rare = sum(1 for t in words if zipf_frequency(t.lemma_.lower(), "en") < 2.5)
+    lemmas = sorted({t.lemma_.lower() for t in words})
+    zipf = dict(zip(lemmas, zipf_frequencies(lemmas)))
+    rare = sum(1 for t in words if zipf[t.lemma_.lower()] < 2.5)
     return rare / len(words)
 
 def share_awl(doc, awl_path: Optional[str] = None) -> float:
-    words = _alpha_tokens(doc)
+    words = alpha_tokens(doc)
     if not words:
         return 0.0
     awl = _load_awl(awl_path)
@@ -77,17 +78,11 @@ def share_awl(doc, awl_path: Optional[str] = None) -> float:
 def avg_syllables_per_word(doc) -> float:
     if textstat is None:
         return 0.0
-    words = _alpha_tokens(doc)
+    words = alpha_tokens(doc)
     if not words:
         return 0.0
-    total_syllables = 0
-    counted = 0
-    for t in words:
-        s = textstat.syllable_count(t.text, lang="en_US")
-        if s is not None:
-            total_syllables += int(s)
-            counted += 1
-    return (total_syllables / counted) if counted else 0.0
+    total_syllables = sum(syllable_count(t.text) for t in words)
+    return total_syllables / len(words)
 
 def extract_lexical(doc) -> Dict[str, float]:
     metrics = {
@@ -1,29 +1,28 @@
 from typing import Dict
 from spacy.tokens import Doc
+from spacy.tokens.morphanalysis import MorphAnalysis
+from spacy.vocab import Vocab
 from functools import lru_cache
 from pathlib import Path
+from src.core.affix_trie import AffixMatcher
+from src.features.shared import alpha_tokens, per_doc
+from src.features.verb_phrases import verb_phrases, tense_aspect_counts
 
 CONTENT_POS = {"NOUN", "VERB", "ADJ", "ADV", "PROPN"}
 FUNCTION_POS = {"ADP", "AUX", "CCONJ", "DET", "PART", "PRON", "SCONJ"}
 
-AFFIX_FILE = Path(__file__).resolve().parents[2] / "assets" / "affixes.txt"
+# token annotations read by this group, see src/features/requirements.py
+REQUIRES = ("pos", "tag", "morph", "lemma", "dep")
 
-def _alpha_tokens(doc: Doc):
-    return [t for t in doc if t.is_alpha]
+AFFIX_FILE = Path(__file__).resolve().parents[2] / "assets" / "affixes.txt"
 
 def _share_by_pos(doc: Doc, pos_set) -> float:
-    words = _alpha_tokens(doc)
+    words = alpha_tokens(doc)
     if not words:
         return 0.0
     pos_count = sum(1 for t in words if t.pos_ in pos_set)
     return pos_count / len(words)
 
-def _verb_heads(doc: Doc):
-    return [t for t in doc if t.pos_ == "VERB"]
-
-def _aux_children(verb):
-    return [c for c in verb.children if c.dep_ in {"aux", "auxpass"}]
-
 def morph_share_nouns(doc: Doc) -> float:
     return _share_by_pos(doc, {"NOUN"})
 
@@ -45,97 +44,40 @@ def morph_share_propn(doc: Doc) -> float:
 def morph_share_aux(doc: Doc) -> float:
     return _share_by_pos(doc, {"AUX"})
 
-def morph_share_modals(doc: Doc) -> float:
-    preds = _predicates(doc)
-    if not preds:
-        return 0.0
-    modal_pred = sum(1 for t in preds if t.tag_ == "MD")
-    return modal_pred / len(preds)
+@per_doc
+def _tense_aspect(doc: Doc) -> Dict[str, int]:
+    return tense_aspect_counts(verb_phrases(doc))
 
-def _predicates(doc: Doc):
-    return [t for t in doc if t.pos_ in {"VERB","AUX"}]
+def _pred_share(doc: Doc, key: str) -> float:
+    # tense, aspect and modality shares over all predicates, from the per-Doc verb phrase table
+    counts = _tense_aspect(doc)
+    if not counts["preds"]:
+        return 0.0
+    return counts[key] / counts["preds"]
 
-def _has_aux_link(v, lemmas=None, tags=None, deps=("aux","auxpass")) -> bool:
-    lemmas = set(lemmas or [])
-    tags = set(tags or [])
-    for n in list(v.children) + list(v.ancestors):
-        if n.dep_ in deps or n.pos_ == "AUX":
-            if (not lemmas or n.lemma_ in lemmas) and (not tags or n.tag_ in tags):
-                return True
-    return False
+def morph_share_modals(doc: Doc) -> float:
+    return _pred_share(doc, "modals")
 
 def morph_tense_past_share(doc: Doc) -> float:
-    preds = _predicates(doc)
-    if not preds:
-        return 0.0
-    past_count = 0
-    for t in preds:
-        if t.pos_ in {"VERB", "AUX"} and "Past" in t.morph.get("Tense"):
-            past_count += 1
-    return past_count / len(preds)
+    return _pred_share(doc, "past")
 
 def morph_tense_present_share(doc: Doc) -> float:
-    preds = _predicates(doc)
-    if not preds:
-        return 0.0
-    pres_count = 0
-    for t in preds:
-        if t.pos_ in {"VERB", "AUX"} and "Pres" in t.morph.get("Tense"):
-            pres_count += 1
-    return pres_count / len(preds)
+    return _pred_share(doc, "present")
 
 def morph_share_perfect(doc: Doc) -> float:
-    preds = _predicates(doc)
-    if not preds:
-        return 0.0
-    perfect_count = 0
-    for v in (t for t in doc if t.pos_ == "VERB"):
-        has_have = _has_aux_link(v, lemmas={"have"})
-        has_be = _has_aux_link(v, lemmas={"be"})
-        is_vbn = (v.tag_ == "VBN")
-        is_perfect_prog = has_have and has_be and (v.tag_ == "VBG")
-        if has_have and is_vbn and not is_perfect_prog:
-            perfect_count += 1
-    return perfect_count / len(preds)
+    return _pred_share(doc, "perfect")
 
 def morph_share_progressive(doc: Doc) -> float:
-    preds = _predicates(doc)
-    if not preds:
-        return 0.0
-    cnt = 0
-    for v in (t for t in doc if t.pos_ == "VERB"):
-        has_be = _has_aux_link(v, lemmas={"be"})
-        has_have = _has_aux_link(v, lemmas={"have"})
-        if has_be and v.tag_ == "VBG" and not has_have:
-            cnt += 1
-    return cnt / len(preds)
+    return _pred_share(doc, "progressive")
 
 def morph_share_perfect_progressive(doc: Doc) -> float:
-    preds = _predicates(doc)
-    if not preds:
-        return 0.0
-    cnt = 0
-    for v in (t for t in doc if t.pos_ == "VERB"):
-        has_have = _has_aux_link(v, lemmas={"have"})
-        has_be = _has_aux_link(v, lemmas={"be"})
-        if has_have and has_be and (v.tag_ == "VBG"):
-            cnt += 1
-    return cnt / len(preds)
+    return _pred_share(doc, "perfect_progressive")
 
 def morph_share_future(doc: Doc) -> float:
-    preds = _predicates(doc)
-    if not preds:
-        return 0.0
-    cnt = 0
-    for v in (t for t in doc if t.pos_ == "VERB"):
-        modal_future = _has_aux_link(v, lemmas={"will","shall","wo"}, tags={"MD"})
-        going_to = any(tok.lemma_ == "go" and tok.tag_ == "VBG" for tok in [v]) and _has_aux_link(v, lemmas={"be"})
-        if modal_future or going_to:
-            cnt += 1
-    return cnt / len(preds)
+    return _pred_share(doc, "future")
 
 def morph_content_function_ratio(doc: Doc) -> float:
-    words = _alpha_tokens(doc)
+    words = alpha_tokens(doc)
     if not words:
         return 0.0
     content = sum(1 for t in words if t.pos_ in CONTENT_POS)
@@ -162,37 +104,57 @@ def load_affixes():
     return prefixes, suffixes
 
 PREFIXES, SUFFIXES = load_affixes()
-
-def _count_morphemes(token) -> int:
-    lemma = (token.lemma_ or token.text).lower()
-    morph_count = 1
-
-    for pref in PREFIXES:
-        if lemma.startswith(pref) and len(lemma) > len(pref) + 2:
-            morph_count += 1
-            break
-
-    for suf in SUFFIXES:
-        if lemma.endswith(suf) and len(lemma) > len(suf) + 2:
-            morph_count += 1
-            break
-
-    morph = token.morph
-
+AFFIXES = AffixMatcher(PREFIXES, SUFFIXES)
+
+# lemma -> affix morphemes for the whole spaCy vocab, filled by precompute_affix_morphemes
+_vocab_affix_morphemes: Dict[str, int] = {}
+# MorphAnalysis key -> inflectional morphemes; bounded by the tagset's feature combinations
+_inflection_morphemes: Dict[int, int] = {}
+
+@lru_cache(maxsize=200_000)
+def _affix_morphemes_cached(lemma: str) -> int:
+    return AFFIXES.count(lemma)
+
+def affix_morphemes(lemma: str) -> int:
+    n = _vocab_affix_morphemes.get(lemma)
+    return n if n is not None else _affix_morphemes_cached(lemma)
+
+def precompute_affix_morphemes(vocab: Vocab) -> int:
+    # Optional at load time (MORPHEME_PRECOMPUTE). The model's words are the keys of its vector
+    # table: the lexemes of a freshly loaded vocab are mostly tokenizer exceptions.
+    strings = vocab.strings
+    words = {lex.lower_ for lex in vocab}
+    words.update(strings[key].lower() for key in vocab.vectors.keys() if key in strings)
+    for word in words:
+        if word.isalpha():
+            _vocab_affix_morphemes[word] = AFFIXES.count(word)
+    return len(_vocab_affix_morphemes)
+
+def _inflections(morph: MorphAnalysis) -> int:
+    n = _inflection_morphemes.get(morph.key)
+    if n is not None:
+        return n
+
+    n = 0
     if morph.get("Tense") or morph.get("VerbForm") or morph.get("Aspect"):
-        morph_count += 1
+        n += 1
 
     if "Plur" in morph.get("Number"):
-        morph_count += 1
+        n += 1
 
     deg = morph.get("Degree")
     if "Cmp" in deg or "Sup" in deg:
-        morph_count += 1
+        n += 1
 
-    return morph_count
+    _inflection_morphemes[morph.key] = n
+    return n
+
+def _count_morphemes(token) -> int:
+    lemma = (token.lemma_ or token.text).lower()
+    return 1 + affix_morphemes(lemma) + _inflections(token.morph)
 
 def morph_avg_morphemes_per_word(doc: Doc) -> float:
-    words = _alpha_tokens(doc)
+    words = alpha_tokens(doc)
     if not words:
         return 0.0
     counts = [_count_morphemes(t) for t in words]
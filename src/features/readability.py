@@ -1,15 +1,46 @@
-from typing import Dict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+import math
+import re
 import textstat
+from spacy.tokens import Doc
+from src.core.syllables import syllable_count
+from src.config.feature_config import READABILITY_ENGINE
+
+DALE_CHALL_FILE = Path(__file__).resolve().parents[2] / "assets" / "dale_chall_easy_words.txt"
+
+# Largest |doc engine - textstat| difference accepted by src/scripts/test_readability_parity.py.
+# Words, syllables and difficult words are counted exactly as textstat does; the remaining
+# difference is sentence segmentation (doc.sents vs textstat's [.!?] regex). Both engines return
+# SMOG 0 below 3 sentences, so the read_smog bound only holds when both count at least 3; the
+# parity script reports texts where they disagree on that separately, as failures.
+READABILITY_TOLERANCE: Dict[str, float] = {
+    "read_flesch": 6.0,
+    "read_fkgl": 2.0,
+    "read_fog": 2.0,
+    "read_smog": 1.0,
+    "read_dale_chall": 0.6,
+}
+
+# token annotations read by this group, see src/features/requirements.py
+REQUIRES = ("sents",) if READABILITY_ENGINE == "doc" else ()
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_DIFFICULT_RE = re.compile(r"[\w\='‘’]+")
+
+def _empty() -> Dict[str, float]:
+    return {
+        "read_flesch": 0.0,
+        "read_fkgl": 0.0,
+        "read_fog": 0.0,
+        "read_smog": 0.0,
+        "read_dale_chall": 0.0
+    }
 
 def extract_readability(text: str) -> Dict[str, float]:
     if textstat is None or not text or not text.strip():
-        return {
-            "read_flesch": 0.0,
-            "read_fkgl": 0.0,
-            "read_fog": 0.0,
-            "read_smog": 0.0,
-            "read_dale_chall": 0.0
-        }
+        return _empty()
 
     textstat.set_lang("en")
 
@@ -21,4 +52,113 @@ def extract_readability(text: str) -> Dict[str, float]:
         "read_dale_chall": textstat.dale_chall_readability_score(text)
     }
 
-    return {k: round(float(v), 3) for k, v in res.items()}
\ No newline at end of file
+    return {k: round(float(v), 3) for k, v in res.items()}
+
+@lru_cache(maxsize=1)
+def load_dale_chall_words(path: Optional[str] = None) -> FrozenSet[str]:
+    words_file = Path(path) if path else DALE_CHALL_FILE
+    if not words_file.exists():
+        return frozenset()
+    with words_file.open("r", encoding="utf-8") as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+# Per whitespace-delimited chunk (textstat's text.split() unit): whether it counts as a word,
+# its syllables and the candidate words of the difficult-word lists.
+@lru_cache(maxsize=100_000)
+def _chunk_stats(chunk: str) -> Tuple[bool, int, Tuple[str, ...]]:
+    lowered = chunk.lower()
+    word = _PUNCT_RE.sub("", lowered)
+    return bool(word), syllable_count(word) if word else 0, tuple(_DIFFICULT_RE.findall(lowered))
+
+def _legacy_round(number: float, points: int) -> float:
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+def _doc_chunks(doc: Doc) -> List[List[str]]:
+    sentences: List[List[str]] = []
+    current = ""
+    for t in doc:
+        if t.is_sent_start or not sentences:
+            if current:
+                sentences[-1].append(current)
+                current = ""
+            sentences.append([])
+        if t.is_space:
+            if current:
+                sentences[-1].append(current)
+                current = ""
+            continue
+        current += t.text
+        if t.whitespace_:
+            sentences[-1].append(current)
+            current = ""
+    if current:
+        sentences[-1].append(current)
+    return sentences
+
+def readability_counts(doc: Doc) -> Dict[str, object]:
+    words = 0
+    syllables = 0
+    poly_syllables = 0
+    long_sentences = 0
+    candidates = set()
+    for chunks in _doc_chunks(doc):
+        sent_words = 0
+        for chunk in chunks:
+            is_word, word_syllables, found = _chunk_stats(chunk)
+            if is_word:
+                sent_words += 1
+                syllables += word_syllables
+            if word_syllables >= 3:
+                poly_syllables += 1
+            candidates.update(found)
+        words += sent_words
+        if sent_words > 2:
+            long_sentences += 1
+    return {
+        "words": words,
+        "syllables": syllables,
+        "poly_syllables": poly_syllables,
+        "long_sentences": long_sentences,
+        "candidates": candidates,
+    }
+
+def readability_metrics(counts: Dict[str, object]) -> Dict[str, float]:
+    words = counts["words"]
+    if textstat is None or words == 0:
+        return _empty()
+
+    sentence_count = max(1, counts["long_sentences"])
+    not_easy = [w for w in counts["candidates"] if w not in load_dale_chall_words()]
+    difficult_fog = sum(1 for w in not_easy if syllable_count(w) >= 3)
+
+    asl = _legacy_round(words / sentence_count, 1)
+    asw = _legacy_round(counts["syllables"] / words, 1)
+
+    per_difficult = 100 - (words - len(not_easy)) / words * 100
+    dale_chall = 0.1579 * per_difficult + 0.0496 * asl
+    if per_difficult > 5:
+        dale_chall += 3.6365
+
+    smog = 0.0
+    if sentence_count >= 3:
+        smog = _legacy_round(1.043 * (30 * (counts["poly_syllables"] / sentence_count)) ** .5 + 3.1291, 1)
+
+    res = {
+        "read_flesch": _legacy_round(206.835 - 1.015 * asl - 84.6 * asw, 2),
+        "read_fkgl": _legacy_round(0.39 * asl + 11.8 * asw - 15.59, 1),
+        "read_fog": _legacy_round(0.4 * (asl + difficult_fog / words * 100), 2),
+        "read_smog": smog,
+        "read_dale_chall": _legacy_round(dale_chall, 2),
+    }
+    return {k: round(float(v), 3) for k, v in res.items()}
+
+def extract_readability_doc(doc: Doc) -> Dict[str, float]:
+    if textstat is None or not doc.text.strip():
+        return _empty()
+    return readability_metrics(readability_counts(doc))
+
+def readability_from_doc(doc: Doc, norm_text: str) -> Dict[str, float]:
+    if READABILITY_ENGINE == "doc":
+        return extract_readability_doc(doc)
+    return extract_readability(norm_text)
@@ -0,0 +1,106 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from spacy.tokens import Doc
+from src.features import lexical, syntax, morph, semantics
+from src.features.readability import readability_from_doc
+from src.features.requirements import group_features
+from src.features.shared import release
+from src.core.timing import timed
+from src.config.model_config import FEATURE_ORDER
+from src.config.feature_config import FEATURE_GROUPS
+
+class Extractor:
+    def __init__(self, group: str, features: Tuple[str, ...], fn: Callable[[Doc], Dict[str, float]],
+                 shares: Tuple[str, ...] = (), stage: Optional[str] = None):
+        self.group = group
+        self.features = features
+        self.fn = fn
+        # per-Doc intermediates from src.features.shared (or module-level per_doc helpers) it reads
+        self.shares = shares
+        # name under which its time is reported (src.core.timing), the group unless set
+        self.stage = stage or group
+
+    def __call__(self, doc: Doc) -> Dict[str, float]:
+        return self.fn(doc)
+
+def _scalar(group: str, name: str, fn: Callable[[Doc], float], shares: Tuple[str, ...] = (),
+            stage: Optional[str] = None) -> Extractor:
+    return Extractor(group, (name,), lambda doc: {name: fn(doc)}, shares, stage)
+
+EXTRACTORS: List[Extractor] = [
+    _scalar("lexical", "lex_avg_word_len", lexical.avg_word_len, ("alpha_tokens",)),
+    _scalar("lexical", "lex_ttr_lemma", lexical.type_token_ratio_lemma, ("alpha_tokens",)),
+    _scalar("lexical", "lex_share_stop", lexical.share_stopwords, ("alpha_tokens",)),
+    _scalar("lexical", "lex_share_num_symbol", lexical.share_num_symbol),
+    _scalar("lexical", "lex_share_oov", lexical.share_oov, ("alpha_tokens",)),
+    _scalar("lexical", "lex_share_awl", lexical.share_awl, ("alpha_tokens",)),
+    _scalar("lexical", "lex_avg_syll_per_word", lexical.avg_syllables_per_word, ("alpha_tokens",)),
+
+    _scalar("syntax", "syn_avg_sentence_length", syntax.avg_sentence_length, ("sentences",)),
+    _scalar("syntax", "syn_avg_clause_per_sentence", syntax.avg_clause_per_sentence, ("sentences",)),
+    _scalar("syntax", "syn_share_complex_sentences", syntax.share_complex_sentences, ("sentences",)),
+    _scalar("syntax", "syn_share_passive_sentences", syntax.share_passive_sentences, ("sentences",)),
+    _scalar("syntax", "syn_avg_dependency_depth", syntax.avg_dependency_depth),
+    _scalar("syntax", "syn_share_sub_conjs", syntax.share_subordinate_conjunctions, ("alpha_tokens",)),
+    _scalar("syntax", "syn_avg_coord_per_sentence", syntax.avg_coord_per_sentence, ("sentences",)),
+
+    _scalar("morph", "morph_share_nouns", morph.morph_share_nouns, ("alpha_tokens",)),
+    _scalar("morph", "morph_share_verbs", morph.morph_share_verbs, ("alpha_tokens",)),
+    _scalar("morph", "morph_share_adj", morph.morph_share_adj, ("alpha_tokens",)),
+    _scalar("morph", "morph_share_adv", morph.morph_share_adv, ("alpha_tokens",)),
+    _scalar("morph", "morph_share_pronouns", morph.morph_share_pronouns, ("alpha_tokens",)),
+    _scalar("morph", "morph_share_propn", morph.morph_share_propn, ("alpha_tokens",)),
+    _scalar("morph", "morph_share_aux", morph.morph_share_aux, ("alpha_tokens",)),
+    _scalar("morph", "morph_share_modals", morph.morph_share_modals, ("verb_phrases",)),
+    _scalar("morph", "morph_tense_past_share", morph.morph_tense_past_share, ("verb_phrases",)),
+    _scalar("morph", "morph_tense_present_share", morph.morph_tense_present_share, ("verb_phrases",)),
+    _scalar("morph", "morph_share_perfect", morph.morph_share_perfect, ("verb_phrases",)),
+    _scalar("morph", "morph_share_progressive", morph.morph_share_progressive, ("verb_phrases",)),
+    _scalar("morph", "morph_share_perfect_progressive", morph.morph_share_perfect_progressive, ("verb_phrases",)),
+    _scalar("morph", "morph_share_future", morph.morph_share_future, ("verb_phrases",)),
+    _scalar("morph", "morph_content_function_ratio", morph.morph_content_function_ratio, ("alpha_tokens",)),
+    _scalar("morph", "morph_avg_morphemes_per_word", morph.morph_avg_morphemes_per_word, ("alpha_tokens",)),
+
+    Extractor("semantics", ("sem_mean_zipf", "sem_share_rare_zipf_lt_4", "sem_share_very_rare_zipf_lt_3"),
+              semantics.sem_zipf_stats, ("alpha_tokens",)),
+    _scalar("semantics", "sem_avg_polysemy", semantics.sem_avg_polysemy, ("content_tokens",), "wordnet"),
+    _scalar("semantics", "sem_avg_hypernym_depth", semantics.sem_avg_hypernym_depth, ("content_tokens",), "wordnet"),
+    Extractor("semantics", ("sem_avg_sent_sim", "sem_min_sent_sim", "sem_std_sent_sim"),
+              semantics.sem_sentence_coherence, ("sentences", "token_vectors")),
+    _scalar("semantics", "sem_word_vector_dispersion", semantics.sem_word_vector_dispersion, ("token_vectors",)),
+
+    Extractor("readability", ("read_flesch", "read_fkgl", "read_fog", "read_smog", "read_dale_chall"),
+              lambda doc: readability_from_doc(doc, doc.text)),
+]
+
+FEATURE_EXTRACTORS: Dict[str, Extractor] = {name: e for e in EXTRACTORS for name in e.features}
+
+def resolve_features(features: Optional[Iterable[str]] = None) -> List[str]:
+    enabled = group_features(FEATURE_ORDER, FEATURE_GROUPS)
+    if features is None:
+        return enabled
+
+    requested = set(features)
+    unknown = sorted(requested - set(FEATURE_EXTRACTORS))
+    if unknown:
+        raise ValueError(f"Unknown features: {', '.join(unknown)}")
+    disabled = sorted(requested - set(enabled))
+    if disabled:
+        raise ValueError(f"Features not enabled in FEATURE_GROUPS: {', '.join(disabled)}")
+    return [name for name in FEATURE_ORDER if name in requested]
+
+def feature_groups(features: Iterable[str]) -> List[str]:
+    groups = {FEATURE_EXTRACTORS[name].group for name in features}
+    return [g for g in FEATURE_GROUPS if g in groups]
+
+def extract_features(doc: Doc, features: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    names = resolve_features(features)
+    values: Dict[str, float] = {}
+    try:
+        for name in names:
+            if name not in values:
+                extractor = FEATURE_EXTRACTORS[name]
+                with timed(extractor.stage):
+                    values.update(extractor(doc))
+    finally:
+        release(doc)
+    return {name: round(float(values[name]), 3) for name in names}
@@ -0,0 +1,33 @@
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+from src.features import lexical, syntax, morph, semantics, readability
+from src.config.feature_config import FEATURE_GROUPS
+
+GROUP_REQUIRES: Dict[str, Tuple[str, ...]] = {
+    "lexical": lexical.REQUIRES,
+    "syntax": syntax.REQUIRES,
+    "morph": morph.REQUIRES,
+    "semantics": semantics.REQUIRES,
+    "readability": readability.REQUIRES,
+}
+
+GROUP_PREFIXES: Dict[str, str] = {
+    "lexical": "lex_",
+    "syntax": "syn_",
+    "morph": "morph_",
+    "semantics": "sem_",
+    "readability": "read_",
+}
+
+def check_groups(groups: Iterable[str]) -> Tuple[str, ...]:
+    groups = tuple(groups)
+    unknown = [g for g in groups if g not in GROUP_REQUIRES]
+    if unknown:
+        raise ValueError(f"Unknown feature groups: {', '.join(unknown)}")
+    return groups
+
+def pipeline_requirements(groups: Iterable[str] = FEATURE_GROUPS) -> FrozenSet[str]:
+    return frozenset(r for g in check_groups(groups) for r in GROUP_REQUIRES[g])
+
+def group_features(feature_names: Iterable[str], groups: Iterable[str] = FEATURE_GROUPS) -> List[str]:
+    prefixes = tuple(GROUP_PREFIXES[g] for g in check_groups(groups))
+    return [name for name in feature_names if name.startswith(prefixes)]
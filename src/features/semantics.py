@@ -1,36 +1,59 @@
 from typing import Dict, List, Tuple
-from statistics import mean, pstdev
+from statistics import mean
+import numpy as np
 from spacy.tokens import Doc
+from spacy.attrs import ORTH, IS_ALPHA, POS
+from spacy.parts_of_speech import IDS as POS_IDS
 from functools import lru_cache
 
-try:
-    from wordfreq import zipf_frequency
-except Exception:
-    zipf_frequency = None
-
-try:
-    from nltk.corpus import wordnet as wn
-except Exception:
-    wn = None
+from src.core.zipf_lexicon import zipf_frequencies, zipf_available
+from src.core.wordnet_table import load_wordnet_table
+from src.features.shared import per_doc, alpha_tokens, sentences
 
 CONTENT_POS = {"NOUN", "VERB", "ADJ", "ADV", "PROPN"}
-SP2WN = {"NOUN": wn.NOUN, "VERB": wn.VERB, "ADJ": wn.ADJ, "ADV": wn.ADV} if wn is not None else {}
+CONTENT_POS_IDS = np.array([POS_IDS[p] for p in CONTENT_POS], dtype=np.uint64)
+SP2WN = {"NOUN": "n", "VERB": "v", "ADJ": "a", "ADV": "r"}
+
+# token annotations read by this group, see src/features/requirements.py
+REQUIRES = ("sents", "pos", "lemma", "vectors")
 
-def _alpha_tokens(doc: Doc):
-    return [t for t in doc if t.is_alpha]
+@lru_cache(maxsize=1)
+def _wordnet():
+    try:
+        from nltk.corpus import wordnet as wn
+        wn.ensure_loaded()
+    except Exception:
+        return None
+    return wn
 
+def wordnet_available() -> bool:
+    return load_wordnet_table() is not None or _wordnet() is not None
+
+@per_doc
 def _content_tokens(doc: Doc):
-    return [t for t in _alpha_tokens(doc) if t.pos_ in CONTENT_POS]
+    return [t for t in alpha_tokens(doc) if t.pos_ in CONTENT_POS]
 
 @lru_cache(maxsize=100_000)
 def _polysemy_cached(lemma: str, wn_pos):
-    if wn is None or wn_pos is None:
+    if wn_pos is None:
+        return 0
+    table = load_wordnet_table()
+    if table is not None:
+        return table.lookup(lemma, wn_pos)[0]
+    wn = _wordnet()
+    if wn is None:
         return 0
     return len(wn.synsets(lemma, pos=wn_pos))
 
 @lru_cache(maxsize=100_000)
 def _max_hyper_depth_cached(lemma: str, wn_pos):
-    if wn is None or wn_pos is None:
+    if wn_pos is None:
+        return 0
+    table = load_wordnet_table()
+    if table is not None:
+        return table.lookup(lemma, wn_pos)[1]
+    wn = _wordnet()
+    if wn is None:
         return 0
     depths = []
     for s in wn.synsets(lemma, pos=wn_pos):
@@ -43,14 +66,17 @@ def _max_hyper_depth_cached(lemma: str, wn_pos):
     return max(depths) if depths else 0
 
 def sem_zipf_stats(doc: Doc) -> Dict[str, float]:
-    words = _alpha_tokens(doc)
-    if not words or zipf_frequency is None:
+    words = alpha_tokens(doc)
+    if not words or not zipf_available():
         return {
             "sem_mean_zipf": 0.0,
             "sem_share_rare_zipf_lt_4": 0.0,
             "sem_share_very_rare_zipf_lt_3": 0.0
         }
-    vals = [zipf_frequency(t.lemma_.lower() or t.text.lower(), "en") for t in words]
+    keys = [t.lemma_.lower() or t.text.lower() for t in words]
+    uniq = sorted(set(keys))
+    zipf = dict(zip(uniq, zipf_frequencies(uniq).tolist()))
+    vals = [zipf[k] for k in keys]
     rare = sum(1 for v in vals if v < 4.0)
     very_rare = sum(1 for v in vals if v < 3.0)
     n = len(vals)
@@ -67,7 +93,7 @@ def _lemma_synset_count(token) -> int:
 
 def sem_avg_polysemy(doc: Doc) -> float:
     toks = _content_tokens(doc)
-    if not toks or wn is None:
+    if not toks or not wordnet_available():
         return 0.0
     counts = [_lemma_synset_count(t) for t in toks]
     return float(mean(counts)) if counts else 0.0
@@ -79,61 +105,65 @@ def _max_hypernym_depth(token) -> int:
 
 def sem_avg_hypernym_depth(doc: Doc) -> float:
     toks = _content_tokens(doc)
-    if not toks or wn is None:
+    if not toks or not wordnet_available():
         return 0.0
     vals = [_max_hypernym_depth(t) for t in toks]
     return float(mean(vals)) if vals else 0.0
 
-def _sent_vectors(doc: Doc) -> List:
-    vecs = []
-    for s in doc.sents:
-        if hasattr(s, "vector") and s.vector is not None:
-            vecs.append(s.vector)
-    return vecs
-
-def _cosine(a, b) -> float:
-    import math
-    dot = sum(x*y for x, y in zip(a, b))
-    na = math.sqrt(sum(x*x for x in a))
-    nb = math.sqrt(sum(y*y for y in b))
-    if na == 0.0 or nb == 0.0:
-        return 0.0
-    return dot / (na * nb)
+@per_doc
+def _token_vectors(doc: Doc) -> Tuple[np.ndarray, np.ndarray]:
+    vectors = doc.vocab.vectors
+    if "vector" in doc.user_token_hooks or getattr(vectors, "mode", "default") != "default":
+        mat = np.array([t.vector for t in doc], dtype="f").reshape(len(doc), -1)
+        return mat, np.array([t.has_vector for t in doc], dtype=bool)
+    if vectors.size == 0 and doc.tensor.size != 0:
+        return np.asarray(doc.tensor, dtype="f"), np.ones(len(doc), dtype=bool)
+
+    keys = doc.to_array(getattr(vectors, "attr", ORTH))
+    rows = vectors.find(keys=keys)
+    has_vector = rows >= 0
+    mat = np.zeros((len(doc), vectors.shape[1]), dtype="f")
+    mat[has_vector] = vectors.data[rows[has_vector]]
+    return mat, has_vector
+
+def _sent_vectors(doc: Doc, sents: List, token_vecs: np.ndarray) -> np.ndarray:
+    if "vector" in doc.user_span_hooks:
+        return np.array([s.vector for s in sents], dtype=np.float64)
+    starts = np.array([s.start for s in sents], dtype=np.int64)
+    lengths = np.diff(np.append(starts, len(doc)))
+    sums = np.add.reduceat(token_vecs.astype(np.float64), starts, axis=0)
+    return sums / lengths[:, None]
+
+def _cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    dots = np.einsum("ij,ij->i", a, b)
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    out = np.zeros(len(dots), dtype=np.float64)
+    np.divide(dots, norms, out=out, where=norms != 0.0)
+    return out
 
 def sem_sentence_coherence(doc: Doc) -> Dict[str, float]:
-    sents = list(doc.sents)
+    sents = sentences(doc)
     if len(sents) < 2:
         return {"sem_avg_sent_sim": 0.0, "sem_min_sent_sim": 0.0, "sem_std_sent_sim": 0.0}
-    vecs = _sent_vectors(doc)
-    if len(vecs) < 2:
-        return {"sem_avg_sent_sim": 0.0, "sem_min_sent_sim": 0.0, "sem_std_sent_sim": 0.0}
-    sims = []
-    for i in range(len(vecs)-1):
-        sims.append(_cosine(vecs[i], vecs[i+1]))
+    token_vecs, _ = _token_vectors(doc)
+    vecs = _sent_vectors(doc, sents, token_vecs)
+    sims = _cosine_rows(vecs[:-1], vecs[1:])
     return {
-        "sem_avg_sent_sim": float(mean(sims)),
-        "sem_min_sent_sim": float(min(sims)),
-        "sem_std_sent_sim": float(pstdev(sims)) if len(sims) > 1 else 0.0,
+        "sem_avg_sent_sim": float(sims.mean()),
+        "sem_min_sent_sim": float(sims.min()),
+        "sem_std_sent_sim": float(sims.std()) if len(sims) > 1 else 0.0,
     }
 
 def sem_word_vector_dispersion(doc: Doc) -> float:
-    toks = [t for t in _content_tokens(doc) if t.has_vector]
-    if len(toks) < 2:
+    token_vecs, has_vector = _token_vectors(doc)
+    attrs = doc.to_array([IS_ALPHA, POS])
+    content = attrs[:, 0].astype(bool) & np.isin(attrs[:, 1], CONTENT_POS_IDS)
+    mat = token_vecs[content & has_vector].astype(np.float64)
+    if len(mat) < 2:
         return 0.0
-    dim = len(toks[0].vector)
-    centroid = [0.0] * dim
-    for t in toks:
-        v = t.vector
-        for i in range(dim):
-            centroid[i] += v[i]
-    centroid = [x / len(toks) for x in centroid]
-
-    def cos_sim(v, c):
-        return _cosine(v, c)
-    sims = [cos_sim(t.vector, centroid) for t in toks]
-
-    dists = [1.0 - s for s in sims]
-    return float(mean(dists))
+    centroid = mat.mean(axis=0)
+    sims = _cosine_rows(mat, np.broadcast_to(centroid, mat.shape))
+    return float((1.0 - sims).mean())
 
 def extract_semantics(doc: Doc) -> Dict[str, float]:
     res = {}
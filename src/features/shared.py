@@ -0,0 +1,37 @@
+from functools import wraps
+from typing import Callable, Dict, List, TypeVar
+from spacy.tokens import Doc, Token
+
+CACHE_KEY = "features.intermediates"
+
+T = TypeVar("T")
+
+def per_doc(fn: Callable[[Doc], T]) -> Callable[[Doc], T]:
+    # Memoizes fn(doc) in doc.user_data so every extractor of a request shares one result.
+    # Spans and other doc-likes without user_data are computed directly.
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @wraps(fn)
+    def wrapper(doc):
+        user_data = getattr(doc, "user_data", None)
+        if user_data is None:
+            return fn(doc)
+        cache: Dict[str, object] = user_data.setdefault(CACHE_KEY, {})
+        if name not in cache:
+            cache[name] = fn(doc)
+        return cache[name]
+
+    return wrapper
+
+def release(doc: Doc):
+    # Intermediates hold Token objects; drop them so the Doc stays serializable.
+    doc.user_data.pop(CACHE_KEY, None)
+
+@per_doc
+def alpha_tokens(doc: Doc) -> List[Token]:
+    return [t for t in doc if t.is_alpha]
+
+@per_doc
+def sentences(doc: Doc) -> List:
+    return list(doc.sents)
+
@@ -1,29 +1,39 @@
 from typing import Dict
 from spacy.tokens import Doc
+from src.core.dep_tree import DepTree
+from src.features.shared import alpha_tokens, sentences as shared_sentences
+
+# token annotations read by this group, see src/features/requirements.py
+REQUIRES = ("sents", "pos", "tag", "morph", "lemma", "dep")
+
+SUB_CONJS = {
+    "although", "because", "before", "if", "since", "though",
+    "unless", "until", "when", "whenever", "whereas", "while"
+}
 
 def avg_sentence_length(doc: Doc) -> float:
-    sentences = list(doc.sents)
+    sentences = shared_sentences(doc)
     if not sentences:
         return 0.0
     length = [len([t for t in s if t.is_alpha]) for s in sentences]
     return sum(length) / len(length)
 
 def avg_clause_per_sentence(doc: Doc) -> float:
-    sentences = list(doc.sents)
+    sentences = shared_sentences(doc)
     if not sentences:
         return 0.0
     clauses = [sum(1 for t in s if t.pos_ in ("VERB","AUX") and "Fin" in t.morph.get("VerbForm", [])) for s in sentences]
     return sum(clauses) / len(clauses)
 
 def share_complex_sentences(doc: Doc) -> float:
-    sentences = list(doc.sents)
+    sentences = shared_sentences(doc)
     if not sentences:
         return 0.0
     complex_sentences_count = sum(1 for s in sentences if sum(1 for t in s if t.pos_ in ("VERB", "AUX")) > 1)
     return complex_sentences_count / len(sentences)
 
 def share_passive_sentences(doc: Doc) -> float:
-    sentences = list(doc.sents)
+    sentences = shared_sentences(doc)
     if not sentences:
         return 0.0
     def is_passive(s):
@@ -35,33 +45,19 @@ def share_passive_sentences(doc: Doc) -> float:
     return passive_sentences_count / len(sentences)
 
 def avg_dependency_depth(doc: Doc) -> float:
-    sentences = list(doc.sents)
-    if not sentences:
+    tree = DepTree.from_doc(doc)
+    has_root = tree.sentence_has_root()
+    if not has_root.any():
         return 0.0
-
-    def depth(token):
-        if not list(token.children):
-            return 1
-        return 1 + max(depth(child) for child in token.children)
-
-    depths = []
-    for s in sentences:
-        roots = [t for t in s if t.head == t]
-        if roots:
-            depths.append(max(depth(r) for r in roots))
-    return sum(depths) / len(depths) if depths else 0.0
+    return float(tree.sentence_max_depth()[has_root].sum()) / int(has_root.sum())
 
 def share_subordinate_conjunctions(doc: Doc) -> float:
-    SUB_CONJS = {
-        "although", "because", "before", "if", "since", "though",
-        "unless", "until", "when", "whenever", "whereas", "while"
-    }
-    tokens = [t for t in doc if t.is_alpha]
+    tokens = alpha_tokens(doc)
     sub_conjs_count = sum(1 for t in tokens if t.pos_ == "SCONJ" or t.lemma_.lower() in SUB_CONJS)
     return sub_conjs_count / len(tokens) if tokens else 0.0
 
 def avg_coord_per_sentence(doc: Doc) -> float:
-    sentences = list(doc.sents)
+    sentences = shared_sentences(doc)
     if not sentences:
         return 0.0
     coord_counts = [
@@ -0,0 +1,122 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from spacy.attrs import DEP, HEAD, LEMMA, POS, TAG
+from spacy.parts_of_speech import IDS as POS_IDS
+from spacy.strings import get_string_id
+from spacy.tokens import Doc
+from src.features.shared import per_doc
+
+# auxiliaries linked to a token (as a child or an ancestor), one bit per kind
+HAVE, BE, FUTURE = 1, 2, 4
+
+AUX_DEPS = frozenset(get_string_id(d) for d in ("aux", "auxpass"))
+FUTURE_LEMMAS = frozenset(get_string_id(w) for w in ("will", "shall", "wo"))
+HAVE_ID, BE_ID, GO_ID = get_string_id("have"), get_string_id("be"), get_string_id("go")
+MD_ID, VBN_ID, VBG_ID = get_string_id("MD"), get_string_id("VBN"), get_string_id("VBG")
+VERB_ID, AUX_ID = POS_IDS["VERB"], POS_IDS["AUX"]
+
+class VerbPhrase(NamedTuple):
+    i: int
+    text: str
+    lemma: str
+    pos: str
+    tag: str
+    # "Past" or "Pres" from the morphology, None when untensed
+    tense: Optional[str]
+    # VERB only: "perfect", "progressive", "perfect_progressive" or "simple"
+    aspect: Optional[str]
+    future: bool
+    # lemma of the modal auxiliary attached to the verb
+    modal: Optional[str]
+    # aux/auxpass children in text order
+    auxiliaries: Tuple[str, ...]
+
+def _aspect(links: int, tag: int) -> str:
+    has_have, has_be = bool(links & HAVE), bool(links & BE)
+    if tag == VBG_ID and has_have and has_be:
+        return "perfect_progressive"
+    if tag == VBN_ID and has_have:
+        return "perfect"
+    if tag == VBG_ID and has_be and not has_have:
+        return "progressive"
+    return "simple"
+
+@per_doc
+def verb_phrases(doc: Doc) -> List[VerbPhrase]:
+    # One row per predicate (VERB or AUX). An auxiliary counts for a verb when it is one of its
+    # children or ancestors and is attached as aux/auxpass or tagged AUX; the child and ancestor
+    # links of every token come from one pass over the heads instead of a walk per verb and feature.
+    arr = doc.to_array([POS, TAG, DEP, HEAD, LEMMA])
+    n = len(doc)
+    pos, tag, dep, lemma = arr[:, 0].tolist(), arr[:, 1].tolist(), arr[:, 2].tolist(), arr[:, 4].tolist()
+    heads = [i + int(h) for i, h in enumerate(arr[:, 3].astype("int64").tolist())]
+
+    own = [0] * n
+    for i in range(n):
+        if dep[i] in AUX_DEPS or pos[i] == AUX_ID:
+            if lemma[i] == HAVE_ID:
+                own[i] = HAVE
+            elif lemma[i] == BE_ID:
+                own[i] = BE
+            elif lemma[i] in FUTURE_LEMMAS and tag[i] == MD_ID:
+                own[i] = FUTURE
+
+    children = [0] * n
+    aux_children: Dict[int, List[int]] = {}
+    modals: Dict[int, int] = {}
+    for i in range(n):
+        h = heads[i]
+        if h == i:
+            continue
+        children[h] |= own[i]
+        if dep[i] in AUX_DEPS:
+            aux_children.setdefault(h, []).append(i)
+        if tag[i] == MD_ID:
+            modals.setdefault(h, i)
+
+    # ancestors[i]: links of everything above i, resolved top-down along each head chain once
+    ancestors = [-1] * n
+    for i in range(n):
+        path = []
+        j = i
+        while ancestors[j] < 0:
+            if heads[j] == j:
+                ancestors[j] = 0
+                break
+            path.append(j)
+            j = heads[j]
+        for k in reversed(path):
+            ancestors[k] = own[heads[k]] | ancestors[heads[k]]
+
+    phrases: List[VerbPhrase] = []
+    for i in range(n):
+        if pos[i] != VERB_ID and pos[i] != AUX_ID:
+            continue
+        t = doc[i]
+        tenses = t.morph.get("Tense")
+        links = children[i] | ancestors[i]
+        is_verb = pos[i] == VERB_ID
+        phrases.append(VerbPhrase(
+            i=i,
+            text=t.text,
+            lemma=t.lemma_,
+            pos=t.pos_,
+            tag=t.tag_,
+            tense="Past" if "Past" in tenses else "Pres" if "Pres" in tenses else None,
+            aspect=_aspect(links, tag[i]) if is_verb else None,
+            future=is_verb and bool(links & FUTURE or (lemma[i] == GO_ID and tag[i] == VBG_ID and links & BE)),
+            modal=doc[modals[i]].lemma_ if i in modals else None,
+            auxiliaries=tuple(doc[a].text for a in aux_children.get(i, ())),
+        ))
+    return phrases
+
+def tense_aspect_counts(phrases: List[VerbPhrase]) -> Dict[str, int]:
+    counts = {"preds": len(phrases), "modals": 0, "past": 0, "present": 0, "perfect": 0,
+              "progressive": 0, "perfect_progressive": 0, "future": 0}
+    for p in phrases:
+        counts["modals"] += p.tag == "MD"
+        counts["past"] += p.tense == "Past"
+        counts["present"] += p.tense == "Pres"
+        counts["future"] += p.future
+        if p.aspect is not None and p.aspect != "simple":
+            counts[p.aspect] += 1
+    return counts
@@ -0,0 +1,212 @@
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import spacy
+import src.api.dependencies.ml_model as ml_model
+from src.api.routes.predict import MODEL_FEATURES, predict_from_text
+from src.collector import features_from_doc
+from src.core.textnorm import normalize_text
+from src.features.lexical import extract_lexical
+from src.features.syntax import extract_syntax
+from src.features.morph import extract_morph
+from src.features.semantics import extract_semantics
+from src.features.readability import readability_from_doc
+from src.features.shared import release
+from src.config.feature_config import FEATURE_ENGINE, FEATURE_GROUPS, READABILITY_ENGINE
+from src.config.api_config import FOREST_ENGINE, MODEL_LOAD_MODE
+
+CORPUS_PATH = Path(__file__).resolve().parents[2] / "assets" / "benchmark_corpus.jsonl"
+PERCENTILES = (50, 95, 99)
+# compared against the baseline; p95 and p99 over a few dozen samples move by more than the
+# threshold between identical runs, so only the median gates
+GATED = ("p50_ms",)
+# run settings that make two results incomparable when they differ
+COMPARABLE_META = ("corpus_sha256", "nlp_version", "model_version", "feature_engine",
+                   "readability_engine", "feature_groups", "forest_engine")
+
+GROUP_EXTRACTORS: Dict[str, Callable] = {
+    "lexical": extract_lexical,
+    "syntax": extract_syntax,
+    "morph": extract_morph,
+    "semantics": extract_semantics,
+}
+
+def load_corpus(path: Path) -> List[Dict]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def stage_calls(nlp, clf, text: str) -> Dict[str, Callable[[], object]]:
+    # One zero-argument call per stage; the later stages reuse the Doc and metrics computed here.
+    norm_text = normalize_text(text)
+    doc = nlp(norm_text)
+    metrics = features_from_doc(doc, norm_text)
+    x = np.array([[metrics[name] for name in MODEL_FEATURES]], dtype=float)
+
+    def on_doc(fn: Callable) -> Callable[[], object]:
+        # release() after every call, so each extractor pays for the shared intermediates it builds
+        def call():
+            try:
+                return fn(doc)
+            finally:
+                release(doc)
+        return call
+
+    stages: Dict[str, Callable[[], object]] = {
+        "normalize_text": lambda: normalize_text(text),
+        "spacy": lambda: nlp(norm_text),
+    }
+    for group, fn in GROUP_EXTRACTORS.items():
+        if group in FEATURE_GROUPS:
+            stages[f"extract_{group}"] = on_doc(fn)
+    if "readability" in FEATURE_GROUPS:
+        stages["extract_readability"] = on_doc(lambda d: readability_from_doc(d, norm_text))
+    # all groups through the configured FEATURE_ENGINE, as the API computes them
+    stages["features"] = lambda: features_from_doc(doc, norm_text)
+    stages["classifier"] = (lambda: clf.predict_proba(x)) if hasattr(clf, "predict_proba") else (lambda: clf.predict(x))
+    stages["predict_from_text"] = lambda: predict_from_text(text)
+    return stages
+
+def _timings(fn: Callable[[], object], repeat: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+def summarize(samples: List[float], chars: int) -> Dict[str, float]:
+    arr = np.asarray(samples, dtype=float)
+    total_s = float(arr.sum()) / 1000.0
+    summary = {"n": len(arr), "mean_ms": round(float(arr.mean()), 4)}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(float(np.percentile(arr, p)), 4)
+    summary["throughput_per_s"] = round(len(arr) / total_s, 2) if total_s else 0.0
+    summary["chars_per_s"] = round(chars / total_s, 1) if total_s else 0.0
+    return summary
+
+def run_benchmark(corpus: List[Dict], repeat: int, warmup: int, only: Optional[List[str]] = None) -> Dict:
+    nlp, clf = ml_model.nlp, ml_model.model_state.clf
+    samples: Dict[str, List[float]] = {}
+    chars: Dict[str, int] = {}
+    by_level: Dict[str, Dict[str, List[float]]] = {}
+    level_chars: Dict[str, Dict[str, int]] = {}
+
+    for item in corpus:
+        text, level = item["text"], item["level"]
+        for stage, fn in stage_calls(nlp, clf, text).items():
+            if only and stage not in only:
+                continue
+            t = _timings(fn, repeat, warmup)
+            samples.setdefault(stage, []).extend(t)
+            chars[stage] = chars.get(stage, 0) + len(text) * len(t)
+            by_level.setdefault(level, {}).setdefault(stage, []).extend(t)
+            level_chars.setdefault(level, {})[stage] = level_chars.get(level, {}).get(stage, 0) + len(text) * len(t)
+
+    return {
+        "stages": {stage: summarize(t, chars[stage]) for stage, t in samples.items()},
+        "by_level": {
+            level: {stage: summarize(t, level_chars[level][stage]) for stage, t in stages.items()}
+            for level, stages in sorted(by_level.items())
+        },
+    }
+
+def run_meta(corpus_path: Path, corpus: List[Dict], repeat: int, warmup: int) -> Dict:
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "spacy": spacy.__version__,
+        "platform": platform.platform(),
+        "corpus": str(corpus_path),
+        "corpus_sha256": hashlib.sha256(corpus_path.read_bytes()).hexdigest()[:16],
+        "texts": len(corpus),
+        "repeat": repeat,
+        "warmup": warmup,
+        "nlp_version": ml_model.nlp_version,
+        "model_version": ml_model.model_state.version,
+        "feature_engine": FEATURE_ENGINE,
+        "readability_engine": READABILITY_ENGINE,
+        "feature_groups": list(FEATURE_GROUPS),
+        "forest_engine": FOREST_ENGINE,
+        "model_load_mode": ml_model.load_mode or MODEL_LOAD_MODE,
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> List[Dict]:
+    # A stage regresses when a gated percentile is both threshold (relative) and min_delta_ms
+    # (absolute) slower than in the baseline; the absolute floor keeps microsecond stages quiet.
+    rows = []
+    for stage, cur in current["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if base is None:
+            continue
+        for key in GATED:
+            ratio = cur[key] / base[key] if base[key] else float("inf")
+            rows.append({
+                "stage": stage,
+                "metric": key,
+                "baseline": base[key],
+                "current": cur[key],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1.0 + threshold and cur[key] - base[key] > min_delta_ms,
+            })
+    return rows
+
+def print_summary(result: Dict):
+    print(f"{'stage':<22}{'n':>6}{'mean ms':>11}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'per s':>11}")
+    for stage, s in result["stages"].items():
+        print(f"{stage:<22}{s['n']:>6}{s['mean_ms']:>11.3f}{s['p50_ms']:>11.3f}{s['p95_ms']:>11.3f}"
+              f"{s['p99_ms']:>11.3f}{s['throughput_per_s']:>11.1f}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the prediction pipeline stage by stage on a fixed CEFR corpus.")
+    ap.add_argument("--corpus", type=str, default=str(CORPUS_PATH), help="JSONL with id, level, text per line.")
+    ap.add_argument("--model-path", type=str, default=None, help="Classifier bundle (default: the API model).")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed runs per text and stage.")
+    ap.add_argument("--warmup", type=int, default=1, help="Untimed runs per text and stage.")
+    ap.add_argument("--stages", type=str, default="", help="Comma-separated subset of stages to run.")
+    ap.add_argument("--output", type=str, default=None, help="Write the results as JSON to this file.")
+    ap.add_argument("--baseline", type=str, default=None, help="Earlier --output file to compare against.")
+    ap.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown flagged as a regression.")
+    ap.add_argument("--min-delta-ms", type=float, default=1.0,
+                    help="Smallest absolute slowdown flagged; below it, differences are run-to-run noise.")
+    args = ap.parse_args()
+
+    corpus_path = Path(args.corpus)
+    corpus = load_corpus(corpus_path)
+    ml_model.load_resources(Path(args.model_path) if args.model_path else None)
+    only = [s.strip() for s in args.stages.split(",") if s.strip()] or None
+
+    result = {"meta": run_meta(corpus_path, corpus, args.repeat, args.warmup)}
+    result.update(run_benchmark(corpus, args.repeat, args.warmup, only))
+    print_summary(result)
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        changed = [k for k in COMPARABLE_META if baseline.get("meta", {}).get(k) != result["meta"][k]]
+        if changed:
+            print(f"Warning: baseline was run with different settings: {', '.join(changed)}")
+        rows = compare(result, baseline, args.threshold, args.min_delta_ms)
+        result["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "rows": rows}
+        regressions = [r for r in rows if r["regression"]]
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} {r['metric']}: {r['baseline']:.3f} -> {r['current']:.3f} ms (x{r['ratio']})")
+        if not regressions:
+            print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%}).")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import argparse
+from pathlib import Path
+from src.config.feature_config import WORDNET_TABLE_DIR
+from src.core.wordnet_table import build_wordnet_table, verify_wordnet_table, WordNetTable
+
+def main():
+    ap = argparse.ArgumentParser(description="Precompute WordNet polysemy and hypernym depth into a memory-mappable table.")
+    ap.add_argument("--out", type=str, default=str(WORDNET_TABLE_DIR), help="Output directory.")
+    ap.add_argument("--verify", action="store_true", help="Compare a sample of lookups against nltk.")
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    count = build_wordnet_table(out)
+    print(f"Saved {count} (lemma, POS) entries to {out}")
+
+    if args.verify:
+        mismatches = verify_wordnet_table(WordNetTable.load(out))
+        print(f"Mismatches against nltk: {mismatches}")
+
+if __name__ == "__main__":
+    main()
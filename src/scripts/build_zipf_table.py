@@ -0,0 +1,16 @@
+import argparse
+from pathlib import Path
+from src.config.feature_config import ZIPF_TABLE_DIR
+from src.core.zipf_lexicon import build_zipf_table
+
+def main():
+    ap = argparse.ArgumentParser(description="Export the wordfreq English list as a memory-mappable zipf table.")
+    ap.add_argument("--out", type=str, default=str(ZIPF_TABLE_DIR), help="Output directory.")
+    ap.add_argument("--wordlist", type=str, default="best", help="wordfreq wordlist name.")
+    args = ap.parse_args()
+
+    count = build_zipf_table(Path(args.out), wordlist=args.wordlist)
+    print(f"Saved {count} entries to {args.out}")
+
+if __name__ == "__main__":
+    main()
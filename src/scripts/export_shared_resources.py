@@ -0,0 +1,26 @@
+import argparse
+from pathlib import Path
+from src.api.dependencies.ml_model import MODEL_PATH, SPACY_MODEL, load_bundle_model, _file_digest
+from src.config.api_config import SHARED_MODEL_DIR
+from src.core.flat_forest import FlatForest
+from src.core.mapped_vectors import export_vectors
+from src.core.spacy_nlp import load_spacy_nlp
+
+def main():
+    ap = argparse.ArgumentParser(description="Export the forest and word vectors as memory-mappable files for MODEL_LOAD_MODE=mmap.")
+    ap.add_argument("--out", type=str, default=str(SHARED_MODEL_DIR), help="Output directory.")
+    ap.add_argument("--model-path", type=str, default=str(MODEL_PATH), help="joblib bundle with the trained forest.")
+    ap.add_argument("--spacy-model", type=str, default=SPACY_MODEL, help="Spacy model whose vectors to export.")
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    model_path = Path(args.model_path)
+    forest = FlatForest.from_sklearn(load_bundle_model(model_path), meta={"model_version": _file_digest(model_path)})
+    forest.save(out / "forest")
+    print(f"Saved {len(forest.roots)} trees ({len(forest.left)} nodes) to {out / 'forest'}")
+
+    count = export_vectors(load_spacy_nlp(args.spacy_model), out / "vectors")
+    print(f"Saved {count} vector keys to {out / 'vectors'}")
+
+if __name__ == "__main__":
+    main()
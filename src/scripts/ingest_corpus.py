@@ -0,0 +1,130 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.collector import collect_features_stream
+from src.db.database import SessionLocal
+from src.db.crud import level_ids, insert_metrics_bulk
+
+# (position in the corpus, text, level name or id)
+Record = Tuple[int, str, str]
+
+def iter_directory(root: Path) -> Iterator[Tuple[str, str]]:
+    # <root>/<LEVEL>/**/*.txt, in a stable order so positions survive a restart
+    for level_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        for f in sorted(level_dir.rglob("*.txt")):
+            yield f.read_text(encoding="utf-8", errors="ignore"), level_dir.name
+
+def iter_jsonl(path: Path, text_field: str, level_field: str) -> Iterator[Tuple[str, str]]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            yield item.get(text_field) or "", str(item.get(level_field, ""))
+
+def iter_csv(path: Path, text_field: str, level_field: str) -> Iterator[Tuple[str, str]]:
+    csv.field_size_limit(sys.maxsize)
+    with path.open(encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield row.get(text_field) or "", str(row.get(level_field) or "")
+
+def iter_records(source: Path, text_field: str, level_field: str) -> Iterator[Record]:
+    if source.is_dir():
+        pairs = iter_directory(source)
+    elif source.suffix.lower() == ".jsonl":
+        pairs = iter_jsonl(source, text_field, level_field)
+    elif source.suffix.lower() == ".csv":
+        pairs = iter_csv(source, text_field, level_field)
+    else:
+        raise SystemExit("Source must be a directory, a .jsonl or a .csv file.")
+    for pos, (text, level) in enumerate(pairs):
+        yield pos, text, level
+
+def resolve_level_id(level: str, levels: Dict[str, int]) -> Optional[int]:
+    level = level.strip()
+    if level.isdigit():
+        return int(level) if int(level) in levels.values() else None
+    return levels.get(level.upper())
+
+def load_checkpoint(path: Path, source: Path) -> Tuple[int, int]:
+    if not path.exists():
+        return 0, 0
+    state = json.loads(path.read_text(encoding="utf-8"))
+    if state.get("source") != str(source.resolve()):
+        raise SystemExit(f"Checkpoint {path} belongs to {state.get('source')}; use another --checkpoint or --restart.")
+    return int(state.get("done", 0)), int(state.get("saved", 0))
+
+def save_checkpoint(path: Path, source: Path, done: int, saved: int):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"source": str(source.resolve()), "done": done, "saved": saved}), encoding="utf-8")
+    tmp.replace(path)
+
+def main():
+    ap = argparse.ArgumentParser(description="Compute metrics for a graded corpus and bulk-insert them into the DB.")
+    ap.add_argument("source", type=str, help="Directory of <LEVEL>/*.txt files, or a .jsonl / .csv file.")
+    ap.add_argument("--text-field", type=str, default="text", help="Text column/key for JSONL and CSV.")
+    ap.add_argument("--level-field", type=str, default="level", help="Level column/key (A1..C2 or level ID).")
+    ap.add_argument("--model", type=str, default="en_core_web_md", help="Spacy model to use.")
+    ap.add_argument("--n-process", type=int, default=1, help="Parser processes for nlp.pipe.")
+    ap.add_argument("--batch-size", type=int, default=64, help="Texts per nlp.pipe batch.")
+    ap.add_argument("--commit-every", type=int, default=500, help="Metrics rows per bulk insert and checkpoint.")
+    ap.add_argument("--checkpoint", type=str, help="Progress file (default: <source>.ingest.json).")
+    ap.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start from the beginning.")
+    args = ap.parse_args()
+
+    source = Path(args.source)
+    if not source.exists():
+        raise SystemExit("Source not found")
+    checkpoint = Path(args.checkpoint) if args.checkpoint else source.with_name(source.name + ".ingest.json")
+    done, saved = (0, 0) if args.restart else load_checkpoint(checkpoint, source)
+    if done:
+        print(f"Resuming after {done} records ({checkpoint})")
+
+    db = SessionLocal()
+    try:
+        levels = level_ids(db)
+        if not levels:
+            raise SystemExit("No levels in the DB; run src/scripts/run_seed_levels.py first.")
+
+        skipped = 0
+        seen = done
+
+        def items():
+            nonlocal skipped, seen
+            for pos, text, level in iter_records(source, args.text_field, args.level_field):
+                if pos < done:
+                    continue
+                seen = pos + 1
+                level_id = resolve_level_id(level, levels)
+                if not text.strip() or level_id is None:
+                    skipped += 1
+                    print(f"Skipping record #{pos}: {'empty text' if not text.strip() else f'unknown level {level!r}'}")
+                    continue
+                yield text, (pos, level_id)
+
+        batch: List[Dict[str, float]] = []
+        resumed_at = saved
+        started = time.perf_counter()
+        stream = collect_features_stream(items(), spacy_model=args.model, batch_size=args.batch_size, n_process=args.n_process)
+        for metrics, (pos, level_id) in stream:
+            batch.append({"level_id": level_id, **metrics})
+            if len(batch) >= args.commit_every:
+                saved += insert_metrics_bulk(db, batch)
+                batch = []
+                # rows are committed before the checkpoint moves, so a crash in between
+                # re-ingests at most one batch rather than losing one
+                save_checkpoint(checkpoint, source, pos + 1, saved)
+                print(f"Saved {saved} rows (through record #{pos}, {(saved - resumed_at) / (time.perf_counter() - started):.1f} texts/s)")
+
+        saved += insert_metrics_bulk(db, batch)
+        save_checkpoint(checkpoint, source, seen, saved)
+        print(f"Done: {saved} rows in the DB from this source, skipped {skipped} records, {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,7 @@ def main():
     ap.add_argument("--text", nargs="+", type=str, help="One or more texts (use quotes)")
     ap.add_argument("--model", type=str, default="en_core_web_md", help="Spacy model to use.")
     ap.add_argument("--file", type=str, help="Path to a UTF-8 .txt file.")
+    ap.add_argument("--features", nargs="+", type=str, help="Compute only these metrics (default: all enabled).")
 
     ap.add_argument("--save-db", action="store_true", help="Save metrics to DB.")
     ap.add_argument("--level", type=str, help="CEFR level name (A1..C2).")
@@ -34,7 +35,7 @@ def main():
     for i, text in enumerate(texts, start=1):
         raw = read_text(text, args.file)
         print(f"/\n Processing text #{i}: {text[:50]} ...")
-        result = collect_all_features(raw, spacy_model=args.model)
+        result = collect_all_features(raw, spacy_model=args.model, features=args.features)
         metrics.append(result)
 
     if not args.save_db:
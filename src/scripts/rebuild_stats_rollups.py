@@ -0,0 +1,15 @@
+from src.db.database import SessionLocal
+from src.db.init_db import init_db
+from src.db.rollups import rebuild_rollups
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        n = rebuild_rollups(db)
+        print(f"Rebuilt {n} analysis rollup rows from analysis_logs")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import argparse
+from pathlib import Path
+from src.config.feature_config import FEATURE_STORE_DIR
+from src.core.feature_store import sync_feature_store, load_feature_store
+from src.db.database import engine
+
+def main():
+    ap = argparse.ArgumentParser(description="Append new metrics rows to the memory-mapped training feature store.")
+    ap.add_argument("--out", type=str, default=str(FEATURE_STORE_DIR), help="Feature store directory.")
+    ap.add_argument("--rebuild", action="store_true", help="Re-export every row (after updates/deletes or a FEATURE_ORDER change).")
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    added = sync_feature_store(engine, out, rebuild=args.rebuild)
+    store = load_feature_store(out)
+    print(f"Added {added} rows; {len(store)} rows up to metrics.id={store.max_id} in {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import time
+from pathlib import Path
+import numpy as np
+from src.api.dependencies.ml_model import MODEL_PATH, load_bundle_model
+from src.core.flat_forest import FlatForest
+
+# per-tree probabilities are summed in a different order, so results differ by rounding only
+TOLERANCE = 1e-12
+
+def probe_rows(forest: FlatForest, n: int, seed: int, nan_share: float = 0.0) -> np.ndarray:
+    # Random rows plus rows sitting exactly on, and one float32 step around, split thresholds;
+    # nan_share of the rows get a missing value in a random feature.
+    rng = np.random.default_rng(seed)
+    # trees fitted on missing values can split "NaN vs everything" with an infinite threshold
+    inner = np.flatnonzero((np.asarray(forest.left) >= 0) & np.isfinite(forest.threshold))
+    feats = np.asarray(forest.feature)[inner]
+    thresholds = np.asarray(forest.threshold)[inner]
+    lo = np.array([thresholds[feats == f].min() if (feats == f).any() else 0.0 for f in range(forest.n_features_in_)])
+    hi = np.array([thresholds[feats == f].max() if (feats == f).any() else 1.0 for f in range(forest.n_features_in_)])
+
+    X = rng.uniform(lo - 1, hi + 1, size=(n, forest.n_features_in_))
+    picks = rng.integers(0, len(inner), size=(n, forest.n_features_in_)) if len(inner) else None
+    if picks is not None:
+        edge = thresholds[picks].astype(np.float32)
+        edge = np.where(rng.random(edge.shape) < 0.5, edge, np.nextafter(edge, np.float32(np.inf)))
+        same_feature = feats[picks] == np.arange(forest.n_features_in_)
+        X = np.where(same_feature, edge, X)
+    nan_rows = np.flatnonzero(rng.random(n) < nan_share)
+    X[nan_rows, rng.integers(0, forest.n_features_in_, size=len(nan_rows))] = np.nan
+    return X
+
+def main():
+    ap = argparse.ArgumentParser(description="Check FlatForest against the sklearn forest it was compiled from.")
+    ap.add_argument("--model-path", type=str, default=str(MODEL_PATH), help="joblib bundle with the trained forest.")
+    ap.add_argument("--rows", type=int, default=5000, help="Number of probe rows.")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--nan-share", type=float, default=0.1, help="Share of probe rows with a missing value.")
+    args = ap.parse_args()
+
+    model = load_bundle_model(Path(args.model_path))
+    forest = FlatForest.from_sklearn(model)
+    X = probe_rows(forest, args.rows, args.seed, args.nan_share)
+
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    proba_mismatch = int((np.abs(expected - actual) > TOLERANCE).any(axis=1).sum())
+    label_mismatch = int((model.predict(X) != forest.predict(X)).sum())
+    print(f"rows: {len(X)}, probability mismatches: {proba_mismatch}, label mismatches: {label_mismatch}, "
+          f"max difference: {float(np.abs(expected - actual).max()):.3g}")
+
+    row = X[:1]
+    for name, fn in (("sklearn", lambda: (model.predict(row), model.predict_proba(row))), ("flat", lambda: forest.predict_proba(row))):
+        start = time.perf_counter()
+        for _ in range(100):
+            fn()
+        print(f"{name}: {(time.perf_counter() - start) * 10:.3f} ms per single-row prediction")
+
+    if proba_mismatch or label_mismatch:
+        raise SystemExit("FlatForest does not match sklearn")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+from pathlib import Path
+from spacy.tokens import Doc
+from src.collector import features_from_doc
+from src.core.sections import split_sections
+from src.core.spacy_nlp import load_spacy_nlp
+from src.core.textnorm import normalize_text
+from src.features.accumulators import FeatureAccumulator
+from src.features.readability import extract_readability_doc
+from src.features.requirements import pipeline_requirements
+
+def main():
+    ap = argparse.ArgumentParser(description="Check merged section accumulators against the same sections as one Doc.")
+    ap.add_argument("file", type=str, help="UTF-8 .txt file with several paragraphs.")
+    ap.add_argument("--model", type=str, default="en_core_web_md", help="Spacy model to use.")
+    ap.add_argument("--section-chars", type=int, default=2000)
+    args = ap.parse_args()
+
+    nlp = load_spacy_nlp(args.model, pipeline_requirements())
+    sections = split_sections(Path(args.file).read_text(encoding="utf-8", errors="ignore"), args.section_chars)
+    docs = list(nlp.pipe(normalize_text(s) for s in sections))
+
+    # Same parses, so any difference comes from merging, not from section boundaries.
+    whole = Doc.from_docs([d.copy() for d in docs])
+    expected = features_from_doc(whole, whole.text)
+    if "read_flesch" in expected:
+        # accumulators always keep the "doc" engine counts
+        expected.update(extract_readability_doc(whole))
+    acc = FeatureAccumulator()
+    for doc in docs:
+        acc.merge(FeatureAccumulator.from_doc(doc))
+    actual = acc.metrics()
+
+    diff = {k: (expected[k], actual[k]) for k in actual if k in expected and expected[k] != actual[k]}
+    print(f"sections: {len(sections)}, features: {len(actual)}, differing: {len(diff)}")
+    for k, (e, a) in diff.items():
+        print(f"  {k}: whole doc {e}, merged {a}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+from pathlib import Path
+from typing import Dict, List
+import textstat
+from src.core.textnorm import normalize_text
+from src.core.spacy_nlp import load_spacy_nlp
+from src.features.readability import (
+    READABILITY_TOLERANCE, extract_readability, extract_readability_doc, readability_counts,
+)
+
+# SMOG is 0 below this many sentences in both engines
+SMOG_MIN_SENTENCES = 3
+
+SAMPLE_TEXTS = [
+    "On the weekend, I like to relax and enjoy my free time. I usually wake up later than on weekdays, and I make a big breakfast with eggs and toast. After that, I clean my room and do some light chores.",
+    "The committee's deliberations, which were prolonged considerably by procedural disagreements, ultimately produced a recommendation that few participants found entirely satisfactory.",
+    "It's raining. We can't go out. Let's read a book instead, shall we? My sister-in-law doesn't like reading, but she'll join us anyway.",
+    "Photosynthesis converts light energy into chemical energy. Chlorophyll absorbs predominantly blue and red wavelengths. Consequently, vegetation appears green to human observers.",
+]
+
+def read_texts(files: List[str]) -> List[str]:
+    texts = []
+    for file in files:
+        p = Path(file)
+        paths = sorted(p.glob("*.txt")) if p.is_dir() else [p]
+        texts.extend(x.read_text(encoding="utf-8", errors="ignore") for x in paths)
+    return texts
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare the Doc-based readability engine with textstat.")
+    ap.add_argument("--file", nargs="+", type=str, help="UTF-8 .txt files or directories with them.")
+    ap.add_argument("--model", type=str, default="en_core_web_md", help="Spacy model to use.")
+    args = ap.parse_args()
+
+    texts = read_texts(args.file) if args.file else SAMPLE_TEXTS
+    nlp = load_spacy_nlp(args.model)
+
+    worst: Dict[str, float] = {k: 0.0 for k in READABILITY_TOLERANCE}
+    failed = 0
+    smog_sentence_mismatches = 0
+    for i, text in enumerate(texts, start=1):
+        norm_text = normalize_text(text)
+        doc = nlp(norm_text)
+        expected = extract_readability(norm_text)
+        actual = extract_readability_doc(doc)
+        # one engine at or above the SMOG sentence minimum and the other below it: 0 against ~10,
+        # which says nothing about the formula, so it is counted on its own
+        textstat_sentences = textstat.sentence_count(norm_text)
+        doc_sentences = readability_counts(doc)["long_sentences"]
+        if (textstat_sentences >= SMOG_MIN_SENTENCES) != (doc_sentences >= SMOG_MIN_SENTENCES):
+            smog_sentence_mismatches += 1
+            print(f"text #{i}: SMOG sentence count textstat={textstat_sentences} doc={doc_sentences}, "
+                  f"read_smog textstat={expected['read_smog']} doc={actual['read_smog']}")
+        for k, tol in READABILITY_TOLERANCE.items():
+            if k == "read_smog" and (textstat_sentences >= SMOG_MIN_SENTENCES) != (doc_sentences >= SMOG_MIN_SENTENCES):
+                continue
+            diff = abs(expected[k] - actual[k])
+            worst[k] = max(worst[k], diff)
+            if diff > tol:
+                failed += 1
+                print(f"text #{i}: {k} textstat={expected[k]} doc={actual[k]} (tolerance {tol})")
+
+    for k, diff in worst.items():
+        print(f"{k}: max diff {diff:.3f} (tolerance {READABILITY_TOLERANCE[k]})")
+    print(f"texts where only one engine has {SMOG_MIN_SENTENCES}+ sentences for SMOG: {smog_sentence_mismatches}")
+    if failed or smog_sentence_mismatches:
+        raise SystemExit(f"{failed} value(s) out of tolerance, {smog_sentence_mismatches} SMOG sentence mismatch(es)")
+
+if __name__ == "__main__":
+    main()
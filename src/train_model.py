@@ -1,23 +1,21 @@
-from sqlalchemy import text
 import pandas as pd
 from src.db.database import engine
+from src.config.feature_config import FEATURE_STORE_DIR
+from src.core.feature_store import sync_feature_store, load_feature_store
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
 
-QUERY = text("SELECT * FROM metrics")
+added = sync_feature_store(engine, FEATURE_STORE_DIR)
+store = load_feature_store(FEATURE_STORE_DIR)
+print(f"Feature store: {len(store)} rows ({added} new)")
 
-df = pd.read_sql(QUERY, engine)
+FEATURE_COLS = store.features
 
-TARGET_COL = "level_id"
-DROP_COLS = ["id", TARGET_COL]
-
-FEATURE_COLS = [c for c in df.columns if c not in DROP_COLS]
-
-X = df[FEATURE_COLS]
-y = df[TARGET_COL]
+X = pd.DataFrame(store.X, columns=FEATURE_COLS, copy=False)
+y = store.y
 
 X_train, X_test, y_train, y_test = train_test_split(
     X,